@@ -0,0 +1,172 @@
+"""
+Persistent cache for Google Places API responses and email enrichment
+results backed by SQLite
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from functools import lru_cache
+from typing import List, Optional
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _loads(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Expired rows are purged once at open and then every this many writes
+_SWEEP_EVERY_PUTS = 500
+
+
+@lru_cache(maxsize=4096)
+def _hash_key(url: str, params_tuple: tuple) -> str:
+    """Hash a URL and its already-sorted params into a cache key"""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(url.encode())
+    h.update(b'|')
+    h.update(_dumps(params_tuple))
+    return h.hexdigest()
+
+
+class APIResponseCache:
+    """Caches API responses in a single SQLite database (WAL mode)"""
+    
+    def __init__(self, cache_dir: str = "cache", ttl_seconds: int = 86400,
+                 enrichment_ttl_seconds: int = 7 * 86400):
+        """
+        Initialize the cache
+        cache_dir: directory holding the database file
+        ttl_seconds: how long a cached response stays valid (default 24h)
+        enrichment_ttl_seconds: how long enrichment results stay valid (default 7 days)
+        """
+        self.cache_dir = cache_dir
+        self.ttl_seconds = ttl_seconds
+        self.enrichment_ttl_seconds = enrichment_ttl_seconds
+        self._puts_since_sweep = 0
+        if not os.path.isdir(cache_dir):
+            os.makedirs(cache_dir, exist_ok=True)
+        
+        self._conn = sqlite3.connect(
+            os.path.join(cache_dir, "api_cache.db"),
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("PRAGMA temp_store=MEMORY")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache("
+            "key TEXT PRIMARY KEY, cached_at REAL, url TEXT, response BLOB)"
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS enrichment("
+            "key TEXT PRIMARY KEY, cached_at REAL, results BLOB)"
+        )
+        self._sweep()
+    
+    def make_key(self, url: str, params: dict) -> str:
+        """
+        Build a stable key from URL and params (API key excluded)
+        Callers doing a get and a put for one request can build it once
+        """
+        params_tuple = tuple(sorted((k, v) for k, v in params.items() if k != 'key'))
+        return _hash_key(url, params_tuple)
+    
+    def get(self, url: str, params: dict, max_age: Optional[float] = None) -> Optional[dict]:
+        """
+        Return cached response or None if missing/expired
+        max_age: seconds, for callers wanting fresher data than ttl_seconds
+        """
+        return self.get_by_key(self.make_key(url, params), max_age)
+    
+    def get_by_key(self, key: str, max_age: Optional[float] = None) -> Optional[dict]:
+        """Like get(), with a key from make_key()"""
+        row = self._conn.execute(
+            "SELECT cached_at, response FROM cache WHERE key=?",
+            (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        cached_at, response = row
+        ttl = self.ttl_seconds if max_age is None else min(max_age, self.ttl_seconds)
+        if time.time() - cached_at > ttl:
+            # Left for the periodic sweep; the read path never deletes
+            return None
+        
+        return _loads(response)
+    
+    def put(self, url: str, params: dict, response: dict):
+        """Store a response"""
+        self.put_by_key(self.make_key(url, params), url, response)
+    
+    def put_by_key(self, key: str, url: str, response: dict):
+        """Like put(), with a key from make_key()"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO cache(key, cached_at, url, response) VALUES (?, ?, ?, ?)",
+            (key, time.time(), url, _dumps(response))
+        )
+        self._count_put()
+    
+    def get_enrichment(self, domain: str, business_name: str) -> Optional[List[dict]]:
+        """Return cached enrichment results (as dicts) or None if missing/expired"""
+        row = self._conn.execute(
+            "SELECT cached_at, results FROM enrichment WHERE key=?",
+            (f"{domain}|{business_name}",)
+        ).fetchone()
+        if row is None:
+            return None
+        
+        cached_at, results = row
+        if time.time() - cached_at > self.enrichment_ttl_seconds:
+            return None
+        
+        return _loads(results)
+    
+    def put_enrichment(self, domain: str, business_name: str, results: List[dict]):
+        """Store enrichment results for a business"""
+        self._conn.execute(
+            "INSERT OR REPLACE INTO enrichment(key, cached_at, results) VALUES (?, ?, ?)",
+            (f"{domain}|{business_name}", time.time(), _dumps(results))
+        )
+        self._count_put()
+    
+    def _count_put(self):
+        """Run the expiry sweep every _SWEEP_EVERY_PUTS writes"""
+        self._puts_since_sweep += 1
+        if self._puts_since_sweep >= _SWEEP_EVERY_PUTS:
+            self._sweep()
+    
+    def _sweep(self):
+        """Delete every expired row from both tables"""
+        now = time.time()
+        self._conn.execute("DELETE FROM cache WHERE cached_at < ?", (now - self.ttl_seconds,))
+        self._conn.execute("DELETE FROM enrichment WHERE cached_at < ?", (now - self.enrichment_ttl_seconds,))
+        self._puts_since_sweep = 0
+    
+    def clear(self):
+        """Remove all cached responses and enrichment results"""
+        self._conn.execute("DELETE FROM cache")
+        self._conn.execute("DELETE FROM enrichment")
+    
+    @property
+    def size(self) -> int:
+        return self._conn.execute("SELECT COUNT(*) FROM cache").fetchone()[0]
+    
+    def close(self):
+        self._conn.close()
@@ -1,25 +1,91 @@
 """
 Email enrichment services for finding business emails
-Supports multiple providers: Hunter.io, Clearbit, and web scraping fallback
+Supports Hunter.io lookups, website crawling and pattern-guess fallback
 """
 
 import asyncio
+import logging
 import re
 import os
-from typing import List, Optional, Dict, Set
-from dataclasses import dataclass
+from collections import OrderedDict
+from typing import List, Optional, Dict, Set, Tuple
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from html import unescape
 from urllib.parse import urlparse, urljoin
-from collections import deque
 
 import aiohttp
-from bs4 import BeautifulSoup
+
+from api_cache import APIResponseCache
+
+logger = logging.getLogger(__name__)
+
+
+# Compiled once at import; runs directly over raw HTML bytes.
+# One pass covers plain, spaced, [at] and (at) obfuscated addresses.
+_EMAIL_RE = re.compile(rb'([A-Za-z0-9._%+-]+)\s*(?:@|\[at\]|\(at\))\s*([A-Za-z0-9.-]+\.[A-Za-z]{2,})')
+_HREF_RE = re.compile(rb'<a\s[^>]*href=["\']([^"\']+)["\']', re.I)
+
+# Placeholder / system addresses, checked after a single split on '@'
+_PLACEHOLDER_LOCALS = frozenset({
+    'email', 'user', 'name', 'yourname', 'firstname',
+    'reply', 'bounces', 'bounce', 'notification', 'notifications',
+})
+_PLACEHOLDER_DOMAIN_LABELS = frozenset({'example', 'test'})
+# Service and asset markers matched anywhere in one scan
+_SKIP_RE = re.compile(r'sentry|no-?reply|do-?not-?reply|\.(?:jpe?g|png|gif|pdf|css|js|svg)')
+
+# Links the crawler never follows
+_SKIP_LINK_PREFIXES = ('tel:', 'mailto:', 'javascript:')
+_SKIP_LINK_RE = re.compile(r'[?#]|\.(?:pdf|jpe?g|png|gif|svg|css|js|ico|woff2?|mp4|zip)$', re.I)
+
+_CONTACT_PAGE_RE = re.compile(r'contact|about|team|staff', re.I)
+_GENERIC_CONFIDENCE_LOCALS = frozenset({'info', 'contact', 'hello', 'support', 'admin', 'sales'})
+_FIRST_LAST_RE = re.compile(r'[a-z]+\.[a-z]+@')
+
+# Pages above this size are scanned in chunks instead of buffered whole
+_MAX_PAGE_BYTES = 2_000_000
+_CHUNK_SIZE = 65536
+_CHUNK_OVERLAP = 256  # Carried between chunks so an address split across them still matches
+
+# A personal address at or above this confidence ends the crawl early
+_EARLY_EXIT_CONFIDENCE = 0.9
+
+
+@lru_cache(maxsize=2048)
+def _canonical_domain(website: str) -> str:
+    """Reduce a website URL to its bare domain (no scheme, path or www.)"""
+    parsed = urlparse(website)
+    domain = parsed.netloc or parsed.path
+    return domain.removeprefix('www.')
+
+
+def _is_false_positive(email: str) -> bool:
+    """Check whether an extracted address is a placeholder, system or asset name"""
+    email_lower = email.lower()
+    local_part, _, domain_part = email_lower.partition('@')
+    
+    if local_part in _PLACEHOLDER_LOCALS:
+        return True
+    if not _PLACEHOLDER_DOMAIN_LABELS.isdisjoint(domain_part.split('.')):
+        return True
+    if _SKIP_RE.search(email_lower):
+        return True
+    
+    # Skip if local part is too long (likely a hash/UUID, not a real email)
+    return len(local_part) > 30
+
+
+def _is_generic(email: str) -> bool:
+    """Check whether an address is a role mailbox like info@ or sales@"""
+    return email.split('@', 1)[0].lower() in EmailEnricher._GENERIC_LOCALS
 
 
 @dataclass
 class EnrichmentResult:
     """Result from email enrichment"""
     email: str
-    source: str  # 'hunter', 'clearbit', 'website', 'guess'
+    source: str  # 'hunter', 'website-crawl', 'guess'
     confidence: float
     type: Optional[str] = None  # 'personal', 'generic', etc.
     position: Optional[str] = None
@@ -30,11 +96,13 @@ class EnrichmentResult:
 class WebsiteCrawler:
     """Crawl website to find email addresses across all pages"""
     
-    def __init__(self, session: aiohttp.ClientSession, max_pages: int = 20):
+    def __init__(self, session: aiohttp.ClientSession, max_pages: int = 20, concurrency: int = 5):
         self.session = session
         self.max_pages = max_pages
+        self.concurrency = concurrency  # Pages fetched in parallel from one site
         self.visited: Set[str] = set()
         self.emails_found: Dict[str, EnrichmentResult] = {}
+        self._found_personal = False  # Set once a high-confidence personal email turns up
     
     async def crawl(self, start_url: str) -> List[EnrichmentResult]:
         """Crawl website starting from URL and find all emails"""
@@ -43,53 +111,81 @@ class WebsiteCrawler:
         
         # Normalize domain
         parsed = urlparse(start_url)
-        base_domain = parsed.netloc.replace('www.', '')
+        base_domain = parsed.netloc.removeprefix('www.')
         
-        # Queue for BFS crawling
-        queue = deque([start_url])
+        # Queue for BFS crawling, priority pages first
+        queue: asyncio.Queue = asyncio.Queue()
         priority_urls = [
             f"{parsed.scheme}://{parsed.netloc}/contact",
             f"{parsed.scheme}://{parsed.netloc}/contact-us",
             f"{parsed.scheme}://{parsed.netloc}/about",
             f"{parsed.scheme}://{parsed.netloc}/team",
-            f"{parsed.scheme}://{parsed.netloc}/staff"
+            f"{parsed.scheme}://{parsed.netloc}/staff",
+            f"{parsed.scheme}://{parsed.netloc}/impressum",
+            f"{parsed.scheme}://{parsed.netloc}/kontakt"
         ]
         
-        # Add priority URLs to front of queue
-        for url in priority_urls:
-            queue.appendleft(url)
+        for url in priority_urls + [start_url]:
+            queue.put_nowait(url)
         
-        while queue and len(self.visited) < self.max_pages:
-            url = queue.popleft()
-            
-            if url in self.visited:
-                continue
-            
-            self.visited.add(url)
-            
-            try:
-                async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                    if response.status == 200:
-                        content_type = response.headers.get('content-type', '').lower()
-                        if 'text/html' not in content_type:
-                            continue
-                        
-                        html = await response.text()
-                        await self._process_page(url, html, base_domain, queue)
-                        
-            except Exception as e:
-                print(f"Error crawling {url}: {e}")
-                continue
+        # Workers overlap network latency across pages
+        workers = [
+            asyncio.create_task(self._worker(queue, base_domain))
+            for _ in range(self.concurrency)
+        ]
+        try:
+            await queue.join()
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
         
         return list(self.emails_found.values())
     
-    async def _process_page(self, url: str, html: str, base_domain: str, queue: deque):
-        """Process a single page - extract emails and find links"""
-        soup = BeautifulSoup(html, 'html.parser')
-        
-        # Extract emails from this page
-        emails = self._extract_emails_from_text(html)
-        
+    async def _worker(self, queue: asyncio.Queue, base_domain: str):
+        """Take URLs off the shared queue until the crawl is cancelled"""
+        while True:
+            url = await queue.get()
+            try:
+                # Check-and-mark has no await in between, so workers never race on it
+                # Once a good personal email is found, the rest of the queue just drains
+                if self._found_personal or url in self.visited or len(self.visited) >= self.max_pages:
+                    continue
+                
+                self.visited.add(url)
+                await self._fetch_page(url, base_domain, queue)
+            finally:
+                queue.task_done()
+    
+    async def _fetch_page(self, url: str, base_domain: str, queue: asyncio.Queue):
+        """Download a single page and process it if it is HTML"""
+        try:
+            async with self.session.get(url, timeout=aiohttp.ClientTimeout(total=15)) as response:
+                if response.status == 200:
+                    content_type = response.headers.get('content-type', '').lower()
+                    if 'text/html' not in content_type:
+                        return
+                    
+                    if (response.content_length or 0) > _MAX_PAGE_BYTES:
+                        await self._scan_large_page(url, response)
+                        return
+                    
+                    html = await response.read()
+                    await self._process_page(url, html, base_domain, queue)
+                    
+        except Exception as e:
+            logger.warning("Error crawling %s: %s", url, e)
+    
+    async def _scan_large_page(self, url: str, response: aiohttp.ClientResponse):
+        """Stream an oversized page through the email regex without buffering it; links are not followed"""
+        tail = b''
+        async for chunk in response.content.iter_chunked(_CHUNK_SIZE):
+            window = tail + chunk
+            self._record_emails(self._extract_emails_from_text(window), url)
+            tail = window[-_CHUNK_OVERLAP:]
+    
+    def _record_emails(self, emails: List[str], url: str):
+        """Add newly seen emails found on a page"""
         for email in emails:
             email_lower = email.lower()
             if email_lower not in self.emails_found:
@@ -102,95 +198,56 @@ class WebsiteCrawler:
                     confidence=confidence,
                     page_url=url
                 )
+                
+                if confidence >= _EARLY_EXIT_CONFIDENCE and not _is_generic(email):
+                    self._found_personal = True
+    
+    async def _process_page(self, url: str, html: bytes, base_domain: str, queue: asyncio.Queue):
+        """Process a single page - extract emails and find links"""
+        # Extract emails from this page
+        self._record_emails(self._extract_emails_from_text(html), url)
         
         # Find more links to crawl (only same domain)
-        if len(self.visited) < self.max_pages:
-            for link in soup.find_all('a', href=True):
-                href = link['href']
+        if not self._found_personal and len(self.visited) < self.max_pages:
+            for match in _HREF_RE.finditer(html):
+                href = unescape(match.group(1).decode('utf-8', 'ignore'))
+                # Skip non-page schemes before paying for urljoin/urlparse
+                if href.startswith(_SKIP_LINK_PREFIXES):
+                    continue
+                
                 full_url = urljoin(url, href)
-                parsed_link = urlparse(full_url)
                 
-                # Only follow links on same domain
-                if parsed_link.netloc.replace('www.', '') == base_domain:
-                    # Skip common non-content URLs
-                    if not any(x in full_url.lower() for x in ['.pdf', '.jpg', '.png', '.gif', '.css', '.js', '?', '#', 'tel:', 'mailto:', 'javascript:']):
-                        if full_url not in self.visited:
-                            queue.append(full_url)
+                # Only follow links on same domain, skipping assets and query/fragment URLs
+                if urlparse(full_url).netloc.removeprefix('www.') == base_domain:
+                    if not _SKIP_LINK_RE.search(full_url) and full_url not in self.visited:
+                        queue.put_nowait(full_url)
     
-    def _extract_emails_from_text(self, text: str) -> List[str]:
-        """Extract email addresses from text with improved pattern"""
-        # Pattern to match email addresses - handles common obfuscations
-        patterns = [
-            r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b',
-            r'[A-Za-z0-9._%+-]+\s*@\s*[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}',  # with spaces
-            r'[A-Za-z0-9._%+-]+\[at\][A-Za-z0-9.-]+\.[A-Z|a-z]{2,}',  # [at] obfuscation
-            r'[A-Za-z0-9._%+-]+\(at\)[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}',  # (at) obfuscation
-        ]
-        
-        emails = []
-        for pattern in patterns:
-            matches = re.findall(pattern, text)
-            emails.extend(matches)
-        
-        # Clean up obfuscated emails
-        cleaned = []
-        for email in emails:
-            email = email.replace('[at]', '@').replace('(at)', '@').replace(' ', '').strip()
-            if re.match(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', email):
-                cleaned.append(email)
+    def _extract_emails_from_text(self, content: bytes) -> List[str]:
+        """Extract email addresses from raw page bytes, handling common obfuscations"""
+        emails = {
+            (m.group(1) + b'@' + m.group(2)).decode('ascii', 'ignore')
+            for m in _EMAIL_RE.finditer(content)
+        }
         
         # Filter out common false positives
-        filtered = []
-        for email in cleaned:
-            email_lower = email.lower()
-            local_part = email_lower.split('@')[0] if '@' in email_lower else ''
-            domain_part = email_lower.split('@')[1] if '@' in email_lower else ''
-            
-            # Skip if contains these patterns
-            skip_patterns = [
-                'example.', 'test.', 'email@', 'user@', 'name@', 'yourname@', 'firstname@',
-                'sentry', 'sentry-next', 'noreply', 'no-reply', 'donotreply', 'do-not-reply',
-                'reply@', 'bounces@', 'bounce@', 'notification@', 'notifications@',
-                '.jpg', '.jpeg', '.png', '.gif', '.pdf', '.css', '.js', '.svg',
-            ]
-            
-            if any(x in email_lower for x in skip_patterns):
-                continue
-            
-            # Skip if local part is too long (likely a hash/UUID, not a real email)
-            if len(local_part) > 30:
-                continue
-            
-            # Skip if looks like a hex hash (32+ chars with only hex digits and maybe dashes/underscores)
-            if len(local_part) >= 32 and all(c in '0123456789abcdef-_' for c in local_part):
-                continue
-            
-            # Skip if contains image file patterns after @
-            if any(ext in domain_part for ext in ['.jpg', '.jpeg', '.png', '.gif']):
-                continue
-            
-            filtered.append(email)
-        
-        return list(set(filtered))
+        return [email for email in emails if not _is_false_positive(email)]
     
     def _calculate_confidence(self, email: str, page_url: str) -> float:
         """Calculate confidence score for an email found on a page"""
         email_lower = email.lower()
-        url_lower = page_url.lower()
         
         base_confidence = 0.85
         
         # Boost for contact/about pages
-        if any(x in url_lower for x in ['contact', 'about', 'team', 'staff']):
+        if _CONTACT_PAGE_RE.search(page_url):
             base_confidence += 0.1
         
         # Reduce for generic emails
-        generic_patterns = ['info@', 'contact@', 'hello@', 'support@', 'admin@', 'sales@']
-        if any(pattern in email_lower for pattern in generic_patterns):
+        if email_lower.partition('@')[0] in _GENERIC_CONFIDENCE_LOCALS:
             base_confidence -= 0.2
         
         # Boost for personal-looking emails (first.last patterns)
-        if re.match(r'^[a-z]+\.[a-z]+@', email_lower):
+        if _FIRST_LAST_RE.match(email_lower):
             base_confidence += 0.05
         
         return min(base_confidence, 1.0)
@@ -204,22 +261,50 @@ class EmailEnricher:
         'admin@', 'sales@', 'marketing@', 'office@',
         'general@', 'enquiries@', 'inquiries@'
     ]
+    _GENERIC_LOCALS = frozenset(p.rstrip('@') for p in GENERIC_PATTERNS)
     
-    def __init__(self):
+    def __init__(
+        self,
+        session: Optional[aiohttp.ClientSession] = None,
+        cache_size: int = 10_000,
+        cache: Optional[APIResponseCache] = None
+    ):
+        """
+        session: optional shared ClientSession; when omitted the enricher
+        creates (and closes) its own pooled session
+        cache_size: max businesses whose results are kept in memory (LRU)
+        cache: optional shared persistent cache; results survive restarts
+        """
         self.hunter_api_key = os.getenv('HUNTER_API_KEY')
-        # Clearbit removed - package is broken
-        self.session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, List[EnrichmentResult]] = {}
+        self.session: Optional[aiohttp.ClientSession] = session
+        self._owns_session = session is None
+        self._cache: OrderedDict[Tuple[str, Optional[str]], List[EnrichmentResult]] = OrderedDict()
+        self._cache_size = cache_size
+        self._owns_cache = cache is None
+        self._api_cache: Optional[APIResponseCache] = cache  # Opened in __aenter__ if not shared
     
     async def __aenter__(self):
-        self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
-        )
+        if self._api_cache is None:
+            self._api_cache = APIResponseCache()
+        if self.session is None:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=100,
+                    limit_per_host=10,
+                    ttl_dns_cache=300,
+                    keepalive_timeout=60
+                ),
+                timeout=aiohttp.ClientTimeout(total=30)
+            )
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        if self.session:
+        if self.session and self._owns_session:
             await self.session.close()
+            self.session = None
+        if self._owns_cache and self._api_cache is not None:
+            self._api_cache.close()
+            self._api_cache = None
     
     async def enrich_business_from_website(self, website: str, business_name: str = "") -> List[EnrichmentResult]:
         """
@@ -229,55 +314,71 @@ class EmailEnricher:
         if not website:
             return []
         
-        # Use the WebsiteCrawler for deep crawling
-        crawler = WebsiteCrawler(self.session, max_pages=15)
-        return await crawler.crawl(website)
+        return await self._scrape_website(website)
     
     async def enrich_business(self, business) -> List[EnrichmentResult]:
         """
         Find emails for a business using multiple methods
         """
-        cache_key = f"{business.name}_{business.website}"
+        cache_key = (business.name, business.website)
         if cache_key in self._cache:
+            self._cache.move_to_end(cache_key)
             return self._cache[cache_key]
         
         results = []
+        domain = _canonical_domain(business.website) if business.website else None
+        
+        # Persistent cache: re-runs skip paid Hunter lookups and crawls
+        if domain:
+            cached = self._api_cache.get_enrichment(domain, business.name)
+            if cached is not None:
+                unique_results = [EnrichmentResult(**r) for r in cached]
+                self._remember(cache_key, unique_results)
+                return unique_results
+        
+        # Method 1: Hunter.io API and Method 2: Scrape website are
+        # independent, so run them concurrently (results keep that order)
+        lookups = []
+        if self.hunter_api_key and domain:
+            lookups.append(self._hunter_lookup(domain))
+        if business.website:
+            lookups.append(self._scrape_website(business.website))
         
-        # Method 1: Hunter.io API
-        if self.hunter_api_key and business.website:
-            hunter_results = await self._hunter_lookup(business.website)
-            results.extend(hunter_results)
+        for lookup_results in await asyncio.gather(*lookups):
+            results.extend(lookup_results)
         
-        # Method 2: Scrape website
-        if business.website:
-            website_results = await self._scrape_website(business.website)
-            results.extend(website_results)
+        # Only Hunter or crawl hits are persisted: guesses after a failed lookup would
+        # otherwise block the retry for the whole enrichment TTL
+        found = bool(results)
         
         # Method 3: Pattern-based guess
-        if business.website and not results:
-            guessed = await self._guess_emails(business)
+        if domain and not results:
+            guessed = await self._guess_emails(business, domain)
             results.extend(guessed)
         
-        # Deduplicate by email
-        seen = set()
-        unique_results = []
+        # Deduplicate by email, first source wins (Hunter before crawl before guess)
+        by_email: Dict[str, EnrichmentResult] = {}
         for r in results:
-            if r.email.lower() not in seen:
-                seen.add(r.email.lower())
-                unique_results.append(r)
+            by_email.setdefault(r.email.lower(), r)
+        unique_results = list(by_email.values())
         
-        self._cache[cache_key] = unique_results
+        if domain and found:
+            self._api_cache.put_enrichment(domain, business.name, [asdict(r) for r in unique_results])
+        
+        self._remember(cache_key, unique_results)
         return unique_results
     
+    def _remember(self, cache_key: Tuple[str, Optional[str]], results: List[EnrichmentResult]):
+        """Store results in the in-memory LRU, evicting the oldest entry when full"""
+        self._cache[cache_key] = results
+        if len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+    
     async def _hunter_lookup(self, domain: str) -> List[EnrichmentResult]:
-        """Look up emails using Hunter.io"""
+        """Look up emails using Hunter.io (domain as returned by _canonical_domain)"""
         results = []
         
         try:
-            parsed = urlparse(domain)
-            domain = parsed.netloc or parsed.path
-            domain = domain.replace('www.', '')
-            
             url = f"https://api.hunter.io/v2/domain-search"
             params = {
                 'domain': domain,
@@ -300,43 +401,7 @@ class EmailEnricher:
                         ))
         
         except Exception as e:
-            print(f"Hunter lookup error for {domain}: {e}")
-        
-        return results
-    
-    async def _clearbit_lookup(self, domain: str) -> List[EnrichmentResult]:
-        """Look up emails using Clearbit"""
-        results = []
-        
-        try:
-            parsed = urlparse(domain)
-            domain = parsed.netloc or parsed.path
-            domain = domain.replace('www.', '')
-            
-            url = f"https://company.clearbit.com/v2/combined/find"
-            params = {'domain': domain}
-            headers = {'Authorization': f'Bearer {self.clearbit_api_key}'}
-            
-            async with self.session.get(url, params=params, headers=headers) as response:
-                if response.status == 200:
-                    data = await response.json()
-                    
-                    # Extract from company data
-                    company = data.get('company', {})
-                    
-                    # Look for email patterns in company data
-                    for person in data.get('people', []):
-                        if 'email' in person:
-                            results.append(EnrichmentResult(
-                                email=person['email'],
-                                source='clearbit',
-                                confidence=0.8,
-                                type='personal',
-                                position=person.get('employment', {}).get('role')
-                            ))
-        
-        except Exception as e:
-            print(f"Clearbit lookup error for {domain}: {e}")
+            logger.warning("Hunter lookup error for %s: %s", domain, e)
         
         return results
     
@@ -345,52 +410,15 @@ class EmailEnricher:
         crawler = WebsiteCrawler(self.session, max_pages=15)
         return await crawler.crawl(url)
     
-    def _extract_emails(self, text: str) -> List[str]:
-        """Extract email addresses from text"""
-        # Pattern to match email addresses
-        pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
-        emails = re.findall(pattern, text)
-        
-        # Filter out common false positives and example emails
-        filtered = []
-        for email in emails:
-            email_lower = email.lower()
-            local_part = email_lower.split('@')[0] if '@' in email_lower else ''
-            domain_part = email_lower.split('@')[1] if '@' in email_lower else ''
-            
-            skip_patterns = [
-                'example.', 'test.', 'email@', 'user@', 'name@', 'yourname@', 'firstname@',
-                'sentry', 'sentry-next', 'noreply', 'no-reply', 'donotreply', 'do-not-reply',
-                'reply@', 'bounces@', 'bounce@', 'notification@', 'notifications@',
-                '.jpg', '.jpeg', '.png', '.gif', '.pdf', '.css', '.js', '.svg',
-            ]
-            
-            if any(x in email_lower for x in skip_patterns):
-                continue
-            
-            if len(local_part) > 30:
-                continue
-            
-            if len(local_part) >= 32 and all(c in '0123456789abcdef-_' for c in local_part):
-                continue
-            
-            if any(ext in domain_part for ext in ['.jpg', '.jpeg', '.png', '.gif']):
-                continue
-            
-            filtered.append(email)
-        
-        return list(set(filtered))
-    
-    async def _guess_emails(self, business) -> List[EnrichmentResult]:
+    async def _guess_emails(self, business, domain: Optional[str] = None) -> List[EnrichmentResult]:
         """Generate likely email patterns based on business info"""
         results = []
         
         if not business.website:
             return results
         
-        parsed = urlparse(business.website)
-        domain = parsed.netloc or parsed.path
-        domain = domain.replace('www.', '')
+        if domain is None:
+            domain = _canonical_domain(business.website)
         
         # Extract name parts
         name_parts = business.name.lower().split()
@@ -418,7 +446,7 @@ class EmailEnricher:
         if not results:
             return None
         
-        # Sort by confidence, prefer verified and non-generic
+        # Rank by confidence, prefer verified and non-generic
         def score_result(r: EnrichmentResult):
             score = r.confidence
             if r.verified:
@@ -427,9 +455,8 @@ class EmailEnricher:
                 score += 0.1
             if r.source == 'hunter':
                 score += 0.05
-            if any(pattern in r.email.lower() for pattern in self.GENERIC_PATTERNS):
+            if _is_generic(r.email):
                 score -= 0.3
             return score
         
-        sorted_results = sorted(results, key=score_result, reverse=True)
-        return sorted_results[0].email if sorted_results else None
+        return max(results, key=score_result).email
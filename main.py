@@ -4,6 +4,7 @@ Main orchestrator for the Google Maps scraper
 
 import asyncio
 import argparse
+import logging
 import os
 from typing import List, Optional
 from datetime import datetime
@@ -15,8 +16,27 @@ from models import SearchConfig, Business, Tile
 from tile_grid import TileGrid, get_city_bounds
 from scraper import GoogleMapsScraper, ScrapingConfig
 from email_enricher import EmailEnricher
+from api_cache import APIResponseCache
 from storage import BusinessStore
 
+logger = logging.getLogger(__name__)
+
+
+class TqdmLoggingHandler(logging.Handler):
+    """Route log records through tqdm.write so progress bars are not broken up"""
+    
+    def emit(self, record):
+        try:
+            tqdm.write(self.format(record))
+        except Exception:
+            self.handleError(record)
+
+
+# Businesses whose websites are crawled at the same time
+ENRICH_CONCURRENCY = 10
+# New businesses collected between progress saves
+SAVE_EVERY = 50
+
 
 class GoogleMapsScraperApp:
     """Main application for scraping Google Maps businesses"""
@@ -25,6 +45,7 @@ class GoogleMapsScraperApp:
         load_dotenv()
         self.store = BusinessStore()
         self.tile_grid: Optional[TileGrid] = None
+        self._since_save = 0  # Businesses added since the last progress save
     
     async def search_area(
         self,
@@ -70,14 +91,14 @@ class GoogleMapsScraperApp:
         # Initialize scraper
         scraping_config = ScrapingConfig(
             headless=headless,
-            delay_between_requests=float(os.getenv('RATE_LIMIT_DELAY', 2.0))
+            delay_between_requests=float(os.getenv('RATE_LIMIT_DELAY', 0.1))
         )
         
         # Process tiles
         await self._process_tiles(tiles, query, scraping_config, enrich_emails)
         
         # Final save
-        self.store.save()
+        self.store.save(force=True)
         
         # Print statistics
         stats = self.store.get_statistics()
@@ -98,45 +119,86 @@ class GoogleMapsScraperApp:
         enrich_emails: bool
     ):
         """Process all tiles"""
-        async with GoogleMapsScraper(config) as scraper:
-            async with EmailEnricher() as enricher:
-                
-                with tqdm(total=len(tiles), desc="Processing tiles") as pbar:
-                    for tile in tiles:
-                        try:
-                            # Search this tile
-                            businesses = await scraper.search_tile(tile, query)
-                            
-                            if businesses:
-                                print(f"\n  Found {len(businesses)} businesses in tile {tile.id}")
+        # One SQLite cache shared by Places responses and enrichment results
+        cache = APIResponseCache()
+        try:
+            async with GoogleMapsScraper(config, cache=cache) as scraper:
+                async with EmailEnricher(cache=cache) as enricher:
+                    
+                    # Tiles are searched concurrently; results are handled as they land
+                    semaphore = asyncio.Semaphore(config.max_concurrent_tiles)
+                    
+                    async def search(tile: Tile):
+                        async with semaphore:
+                            try:
+                                return tile, await scraper.search_tile(tile, query), None
+                            except Exception as e:
+                                return tile, [], e
+                    
+                    if config.dedup_coverage:
+                        searched = self.tile_grid.skip_covered_tiles(tiles)
+                        logger.info("Coverage dedup: searching %d of %d tiles", len(searched), len(tiles))
+                        tiles = searched
+                    
+                    tasks = [asyncio.create_task(search(tile)) for tile in tiles]
+                    
+                    with tqdm(total=len(tiles), desc="Processing tiles") as pbar:
+                        for next_done in asyncio.as_completed(tasks):
+                            tile, businesses, error = await next_done
+                            try:
+                                if error:
+                                    raise error
                                 
-                                # Enrich emails if enabled
-                                if enrich_emails:
-                                    for business in businesses:
-                                        if business.website and not business.email:
-                                            results = await enricher.enrich_business(business)
-                                            if results:
+                                if businesses:
+                                    logger.info("Found %d businesses in tile %s", len(businesses), tile.id)
+                                    
+                                    # Enrich emails if enabled
+                                    if enrich_emails:
+                                        to_enrich = [b for b in businesses if b.website and not b.email]
+                                        async for business, results, error in self._enrich_concurrently(enricher, to_enrich):
+                                            if error:
+                                                logger.warning("  ✗ Error enriching %s: %s", business.name, error)
+                                            elif results:
                                                 best_email = enricher.get_best_email(results)
                                                 business.email = best_email
                                                 business.emails = [r.email for r in results]
-                                                print(f"    ✓ Found {len(results)} email(s) for {business.name}")
+                                                logger.debug("  ✓ Found %d email(s) for %s", len(results), business.name)
+                                    
+                                    # Add to store
+                                    added = self.store.add_many(businesses)
+                                    self._since_save += added
+                                    logger.debug("Added %d new businesses (skipped %d duplicates)", added, len(businesses) - added)
+                                    
+                                    # Save progress every SAVE_EVERY new businesses
+                                    if self._since_save >= SAVE_EVERY:
+                                        self.store.save()
+                                        self._since_save = 0
+                                        logger.info("Progress saved: %d total businesses", self.store.count)
                                 
-                                # Add to store
-                                added = self.store.add_many(businesses)
-                                print(f"  Added {added} new businesses (skipped {len(businesses) - added} duplicates)")
+                                # Mark tile as searched
+                                self.tile_grid.mark_tile_searched(tile.id, len(businesses))
                                 
-                                # Save progress periodically
-                                if self.store.count % 50 == 0:
-                                    self.store.save()
-                                    print(f"  Progress saved: {self.store.count} total businesses")
-                            
-                            # Mark tile as searched
-                            self.tile_grid.mark_tile_searched(tile.id, len(businesses))
+                            except Exception as e:
+                                logger.error("Error processing tile %s: %s", tile.id, e)
                             
-                        except Exception as e:
-                            print(f"Error processing tile {tile.id}: {e}")
-                        
-                        pbar.update(1)
+                            pbar.update(1)
+        finally:
+            cache.close()
+    
+    async def _enrich_concurrently(self, enricher: EmailEnricher, businesses: List[Business]):
+        """Enrich businesses concurrently, yielding (business, results, error) as each finishes"""
+        semaphore = asyncio.Semaphore(ENRICH_CONCURRENCY)
+        
+        async def enrich(business: Business):
+            async with semaphore:
+                try:
+                    return business, await enricher.enrich_business(business), None
+                except Exception as e:
+                    return business, [], e
+        
+        tasks = [asyncio.create_task(enrich(b)) for b in businesses]
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
     
     async def enrich_existing(self):
         """Enrich emails for existing businesses without emails"""
@@ -147,21 +209,19 @@ class GoogleMapsScraperApp:
         
         async with EmailEnricher() as enricher:
             with tqdm(total=len(to_enrich), desc="Enriching emails") as pbar:
-                for business in to_enrich:
-                    try:
-                        results = await enricher.enrich_business(business)
-                        if results:
-                            best_email = enricher.get_best_email(results)
-                            business.email = best_email
-                            business.emails = [r.email for r in results]
-                            self.store.update(business)
-                            print(f"  ✓ {business.name}: {best_email}")
-                    except Exception as e:
-                        print(f"  ✗ Error enriching {business.name}: {e}")
+                async for business, results, error in self._enrich_concurrently(enricher, to_enrich):
+                    if error:
+                        logger.warning("✗ Error enriching %s: %s", business.name, error)
+                    elif results:
+                        best_email = enricher.get_best_email(results)
+                        business.email = best_email
+                        business.emails = [r.email for r in results]
+                        self.store.update(business)
+                        logger.debug("✓ %s: %s", business.name, best_email)
                     
                     pbar.update(1)
         
-        self.store.save()
+        self.store.save(force=True)
         print(f"\nEnrichment complete. Total businesses with email: {self.store.get_statistics()['with_email']}")
 
 
@@ -175,9 +235,14 @@ def main():
     parser.add_argument('--no-enrich', action='store_true', help='Skip email enrichment')
     parser.add_argument('--max-tiles', type=int, help='Maximum number of tiles to process')
     parser.add_argument('--enrich-only', action='store_true', help='Only enrich existing data')
+    parser.add_argument('--verbose', '-v', action='store_true', help='Log every business, not just per-tile progress')
     
     args = parser.parse_args()
     
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[TqdmLoggingHandler()])
+    if args.verbose:
+        logger.setLevel(logging.DEBUG)
+    
     app = GoogleMapsScraperApp()
     
     if args.enrich_only:
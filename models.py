@@ -7,9 +7,9 @@ from typing import Optional, List, Dict, Set
 from datetime import datetime
 
 
-@dataclass
+@dataclass(slots=True, eq=False)
 class Business:
-    """Represents a scraped business"""
+    """Represents a scraped business (identity is place_id only)"""
     place_id: str
     name: str
     address: str
@@ -25,8 +25,8 @@ class Business:
     hours: Optional[Dict] = None
     photos: List[str] = field(default_factory=list)
     description: Optional[str] = None
-    social_media: Dict[str, str] = field(default_factory=dict)
-    scraped_at: datetime = field(default_factory=datetime.now)
+    social_media: Optional[Dict[str, str]] = None
+    scraped_at: Optional[datetime] = None  # Stamped by BusinessStore.add for non-duplicates
     
     def __hash__(self):
         return hash(self.place_id)
@@ -47,6 +47,7 @@ class Tile:
     max_lng: float
     searched: bool = False
     business_count: int = 0
+    search_radius_m: int = 0  # Half the tile diagonal, filled in by TileGrid
     
     @property
     def center(self) -> tuple:
@@ -3,31 +3,43 @@ Rate limiter for controlling request frequency
 """
 
 import asyncio
-import time
 from typing import Optional
 
 
 class RateLimiter:
-    """Simple rate limiter using token bucket algorithm"""
+    """
+    Paces requests to one every min_delay seconds and caps how many run at once
+    Use as `async with limiter: await session.get(...)` so the cap covers the request itself
+    """
     
     def __init__(self, min_delay: float = 2.0, max_concurrent: int = 1):
         self.min_delay = min_delay
         self.max_concurrent = max_concurrent
-        self.last_request_time: Optional[float] = None
+        self._next_available: Optional[float] = None  # loop.time() of the next free slot
         self._semaphore = asyncio.Semaphore(max_concurrent)
-        self._lock = asyncio.Lock()
     
     async def acquire(self):
-        """Acquire permission to make a request"""
-        async with self._semaphore:
-            async with self._lock:
-                if self.last_request_time is not None:
-                    elapsed = time.time() - self.last_request_time
-                    if elapsed < self.min_delay:
-                        wait_time = self.min_delay - elapsed
-                        await asyncio.sleep(wait_time)
-                
-                self.last_request_time = time.time()
+        """Wait for the next pacing slot (does not hold a concurrency slot)"""
+        # Reserve the slot before sleeping, so concurrent callers queue up
+        # behind each other instead of all waking at the same instant
+        now = asyncio.get_running_loop().time()
+        start = now if self._next_available is None else max(now, self._next_available)
+        self._next_available = start + self.min_delay
+        
+        if start > now:
+            await asyncio.sleep(start - now)
+    
+    async def __aenter__(self):
+        await self._semaphore.acquire()
+        try:
+            await self.acquire()
+        except BaseException:
+            self._semaphore.release()
+            raise
+        return self
+    
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        self._semaphore.release()
 
 
 class ProxyRotator:
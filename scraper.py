@@ -1,30 +1,27 @@
 """
-Google Maps Scraper using Places API via HTTP requests
+Google Maps Scraper using Places API via async HTTP requests
 """
 import os
-import time
-import math
-import requests
-from typing import List, Optional, Dict, Tuple
+import asyncio
+import logging
+from contextlib import nullcontext
+from typing import List, Optional, Dict, Set, Tuple
 from dataclasses import dataclass
-from models import Business, Tile
 
+import aiohttp
+import numpy as np
 
-def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """
-    Calculate the great circle distance in kilometers between two points
-    on the earth (specified in decimal degrees)
-    """
-    # Convert decimal degrees to radians
-    lat1, lng1, lat2, lng2 = map(math.radians, [lat1, lng1, lat2, lng2])
-    
-    # Haversine formula
-    dlat = lat2 - lat1
-    dlng = lng2 - lng1
-    a = math.sin(dlat/2)**2 + math.cos(lat1) * math.cos(lat2) * math.sin(dlng/2)**2
-    c = 2 * math.asin(math.sqrt(a))
-    r = 6371  # Radius of earth in kilometers
-    return c * r
+try:
+    import orjson
+except ImportError:  # Fall back to aiohttp's stdlib-json parsing
+    orjson = None
+
+from models import Business, Tile
+from api_cache import APIResponseCache
+from rate_limiter import RateLimiter
+from tile_grid import tile_search_radius_m, haversine_distances
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -35,16 +32,71 @@ class ScrapingConfig:
     timeout: int = 30000
     max_retries: int = 3
     delay_between_requests: float = 2.0
+    max_concurrent_tiles: int = 10  # Tiles searched in parallel
+    dedup_coverage: bool = False  # Skip tiles whose center another tile's search circle already covers
+
+
+def new_places_session() -> aiohttp.ClientSession:
+    """Keep-alive pool that reuses the TLS connection to maps.googleapis.com"""
+    return aiohttp.ClientSession(
+        connector=aiohttp.TCPConnector(limit=20, ttl_dns_cache=300, keepalive_timeout=30)
+    )
 
 
 class GoogleMapsScraper:
     """Scraper using Google Places API"""
     
-    def __init__(self, config=None):
-        self._place_cache: Dict[str, Business] = {}
+    def __init__(self, config=None, cache: Optional[APIResponseCache] = None,
+                 session: Optional[aiohttp.ClientSession] = None):
+        """
+        cache: response cache to share; one is opened (and closed) if not given
+        session: keep-alive pool to share across scrapers; one is created per use if not given
+        """
+        self._seen_place_ids: Set[str] = set()  # Only ids; BusinessStore keeps the records
+        self._owns_cache = cache is None
+        self._api_cache = cache or APIResponseCache()
         self.config = config
+        # Shared by all concurrent tiles: paces API calls (QPS), separate from the tile semaphore
+        self._rate_limiter = RateLimiter(
+            min_delay=config.delay_between_requests,
+            max_concurrent=config.max_concurrent_tiles
+        ) if config else None
         self.api_key = os.getenv('GOOGLE_MAPS_API_KEY')
         self.base_url = "https://maps.googleapis.com/maps/api/place"
+        self._owns_session = session is None
+        self._session: Optional[aiohttp.ClientSession] = session  # Created in __aenter__ if not shared
+        self._inflight: Dict[str, asyncio.Task] = {}  # Cache misses currently being fetched
+    
+    async def _get_json(self, url: str, params: dict) -> dict:
+        """GET a Places API endpoint through the response cache"""
+        # One key serves the cache lookup, the in-flight map and the cache store
+        key = self._api_cache.make_key(url, params)
+        result = self._api_cache.get_by_key(key)
+        if result is not None:
+            return result
+        
+        # Concurrent misses for the same request share one HTTP round trip
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_json(key, url, params))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        # shield: one caller being cancelled must not cancel the shared fetch
+        return await asyncio.shield(task)
+    
+    async def _fetch_json(self, key: str, url: str, params: dict) -> dict:
+        """Perform the HTTP request and cache OK responses"""
+        # The limiter is held until the response is read, so it gates the request itself
+        async with self._rate_limiter or nullcontext():
+            async with self._session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                if orjson is not None:
+                    result = orjson.loads(await response.read())
+                else:
+                    result = await response.json()
+        if result.get('status') == 'OK':
+            self._api_cache.put_by_key(key, url, result)
+        return result
     
     async def search_tile(
         self, 
@@ -62,13 +114,13 @@ class GoogleMapsScraper:
         Filters results to only include those within max_radius_km from center
         """
         
+        # Log lines for the UI are collected and sent as one log_batch when the tile is done
+        log_entries = []
+        
         def log(msg, level='debug'):
-            print(f"[Scraper] {msg}")
+            logger.debug("[Scraper] %s", msg)
             if socketio and job_id:
-                try:
-                    socketio.emit('log_message', {'job_id': job_id, 'message': msg, 'level': level})
-                except:
-                    pass
+                log_entries.append({'message': msg, 'level': level})
         
         businesses = []
         tile_center_lat, tile_center_lng = tile.center
@@ -77,13 +129,8 @@ class GoogleMapsScraper:
         search_center_lat = center_lat if center_lat is not None else tile_center_lat
         search_center_lng = center_lng if center_lng is not None else tile_center_lng
         
-        # Calculate dynamic radius based on tile size with expansion multiplier
-        lat_span = tile.max_lat - tile.min_lat
-        lng_span = tile.max_lng - tile.min_lng
-        lat_km = lat_span * 111
-        lng_km = lng_span * 111 * math.cos(math.radians(tile_center_lat))
-        tile_diagonal_km = math.sqrt(lat_km**2 + lng_km**2)
-        base_radius = int(tile_diagonal_km * 1000 / 2)
+        # Radius is precomputed by TileGrid; tiles built by hand fall back to computing it
+        base_radius = tile.search_radius_m or tile_search_radius_m(*tile.bounds)
         search_radius = min(int(base_radius * api_radius_multiplier), 50000)  # Max 50km
         
         log(f"Searching: {query} near {tile_center_lat:.4f},{tile_center_lng:.4f} (API radius: {search_radius}m, multiplier: {api_radius_multiplier:.1f}x)", 'info')
@@ -91,6 +138,9 @@ class GoogleMapsScraper:
         try:
             url = f"{self.base_url}/textsearch/json"
             all_places = []
+            coords = []
+            within_parts = []  # Per-page within-radius masks, only when filtering by radius
+            radius_filter = max_radius_km is not None and center_lat is not None and center_lng is not None
             next_page_token = None
             page_count = 0
             max_pages = 3
@@ -104,11 +154,16 @@ class GoogleMapsScraper:
                 }
                 
                 if next_page_token:
-                    params['pagetoken'] = next_page_token
-                    time.sleep(0.5)
-                
-                response = requests.get(url, params=params, timeout=10)
-                result = response.json()
+                    # Tokens differ on every run, so later pages are cached by tile query and
+                    # page number; a warm run replays the whole tile without any API call
+                    page_key = self._api_cache.make_key(url, {**params, 'page': page_count + 1})
+                    result = self._api_cache.get_by_key(page_key)
+                    if result is None:
+                        params['pagetoken'] = next_page_token
+                        await asyncio.sleep(0.5)
+                        result = await self._fetch_json(page_key, url, params)
+                else:
+                    result = await self._get_json(url, params)
                 
                 if result.get('status') != 'OK':
                     if result.get('status') == 'INVALID_REQUEST' and next_page_token:
@@ -123,7 +178,27 @@ class GoogleMapsScraper:
                 all_places.extend(places)
                 log(f"Page {page_count + 1}: Found {len(places)} places (total: {len(all_places)})", 'info')
                 
+                locations = [place.get('geometry', {}).get('location', {}) for place in places]
+                page_coords = [(loc.get('lat', tile_center_lat), loc.get('lng', tile_center_lng)) for loc in locations]
+                coords.extend(page_coords)
+                
                 next_page_token = result.get('next_page_token')
+                
+                # Distance from original center for the whole page at once, if specified
+                if radius_filter and page_coords:
+                    coord_array = np.array(page_coords, dtype=np.float64)
+                    distances_km = haversine_distances(center_lat, center_lng, coord_array[:, 0], coord_array[:, 1])
+                    page_within = distances_km <= max_radius_km
+                    within_parts.append(page_within)
+                    
+                    # Results come nearest-first, so a page that is mostly outside
+                    # the radius means later pages will be too
+                    if next_page_token and (
+                        np.median(distances_km) > max_radius_km * 1.2 or page_within.mean() < 0.1
+                    ):
+                        log(f"Page {page_count + 1} is mostly outside {max_radius_km}km, skipping further pages", 'debug')
+                        break
+                
                 if not next_page_token:
                     break
                 
@@ -133,26 +208,29 @@ class GoogleMapsScraper:
             
             log(f"Total from API: {len(all_places)} places", 'info')
             
+            within_radius = np.concatenate(within_parts) if within_parts else None
+            
             # Filter and process results
             filtered_count = 0
-            for place in all_places:
+            for i, place in enumerate(all_places):
                 try:
-                    location = place.get('geometry', {}).get('location', {})
-                    lat = location.get('lat', tile_center_lat)
-                    lng = location.get('lng', tile_center_lng)
+                    lat, lng = coords[i]
                     
-                    # Filter by distance from original center if specified
-                    if max_radius_km is not None and center_lat is not None and center_lng is not None:
-                        distance_km = haversine_distance(center_lat, center_lng, lat, lng)
-                        if distance_km > max_radius_km:
-                            filtered_count += 1
-                            continue  # Skip businesses outside desired radius
+                    if within_radius is not None and not within_radius[i]:
+                        filtered_count += 1
+                        continue  # Skip businesses outside desired radius
+                    
+                    # Duplicates are dropped before any Business is built for them
+                    place_id = place.get('place_id') or f"api_{lat}_{lng}"
+                    if place_id in self._seen_place_ids:
+                        continue
+                    self._seen_place_ids.add(place_id)
                     
                     types = place.get('types', [])
                     category = types[0].replace('_', ' ').title() if types else None
                     
                     business = Business(
-                        place_id=place.get('place_id', f"api_{lat}_{lng}"),
+                        place_id=place_id,
                         name=place.get('name', 'Unknown'),
                         address=place.get('formatted_address', ''),
                         phone=None,
@@ -164,11 +242,8 @@ class GoogleMapsScraper:
                         latitude=lat,
                         longitude=lng
                     )
+                    businesses.append(business)
                     
-                    if business.place_id not in self._place_cache:
-                        self._place_cache[business.place_id] = business
-                        businesses.append(business)
-                        
                 except Exception as e:
                     log(f"Error processing place: {str(e)[:50]}", 'warning')
                     continue
@@ -179,39 +254,92 @@ class GoogleMapsScraper:
             
         except Exception as e:
             log(f"API Error: {str(e)[:80]}", 'error')
+        finally:
+            if log_entries:
+                try:
+                    socketio.emit('log_batch', {'job_id': job_id, 'entries': log_entries})
+                except:
+                    pass
         
         return businesses
     
-    async def get_business_details(self, business: Business) -> Business:
-        """Get detailed info using Place Details API"""
+    async def get_business_details(
+        self,
+        business: Business,
+        need_phone: bool = True,
+        need_website: bool = True,
+        need_hours: bool = True
+    ) -> Business:
+        """
+        Get detailed info using Place Details API
+        Only the requested fields are billed; with none requested no call is made
+        """
+        fields = []
+        if need_phone:
+            fields.append('formatted_phone_number')
+        if need_website:
+            fields.append('website')
+        if need_hours:
+            fields.append('opening_hours')
+        if not fields:
+            return business
         
         try:
             url = f"{self.base_url}/details/json"
             params = {
                 'place_id': business.place_id,
-                'fields': 'formatted_phone_number,website,opening_hours',
+                'fields': ','.join(fields),
                 'key': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            result = response.json()
+            result = await self._get_json(url, params)
             
             if result.get('status') == 'OK':
                 details = result.get('result', {})
-                business.phone = details.get('formatted_phone_number')
-                business.website = details.get('website')
+                if need_phone:
+                    business.phone = details.get('formatted_phone_number')
+                if need_website:
+                    business.website = details.get('website')
                 
                 hours = details.get('opening_hours', {}).get('weekday_text', [])
                 if hours:
                     business.hours = {day: time for day, time in [h.split(': ', 1) for h in hours if ': ' in h]}
         
         except Exception as e:
-            print(f"Error: {e}")
+            logger.error("Details lookup failed for %s: %s", business.place_id, e)
         
         return business
     
+    async def get_many_business_details(self, businesses: List[Business]) -> List[Business]:
+        """
+        Get details for several businesses concurrently, fetching only the fields each one is missing
+        Requests share the keep-alive pool and are paced by the rate limiter
+        """
+        results = await asyncio.gather(
+            *(
+                self.get_business_details(
+                    b,
+                    need_phone=not b.phone,
+                    need_website=not b.website,
+                    need_hours=b.hours is None
+                )
+                for b in businesses
+            ),
+            return_exceptions=True
+        )
+        for business, result in zip(businesses, results):
+            if isinstance(result, Exception):
+                logger.warning("Could not get details for %s: %s", business.name, result)
+        return businesses
+    
     async def __aenter__(self):
+        if self._owns_session:
+            self._session = new_places_session()
         return self
     
     async def __aexit__(self, exc_type, exc_val, exc_tb):
-        pass
+        if self._owns_session and self._session:
+            await self._session.close()
+            self._session = None
+        if self._owns_cache:
+            self._api_cache.close()
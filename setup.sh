@@ -29,7 +29,6 @@ if [ ! -f ".env" ]; then
     echo ""
     echo "⚠️  IMPORTANT: Edit .env and add your API keys:"
     echo "   - HUNTER_API_KEY (from hunter.io)"
-    echo "   - CLEARBIT_API_KEY (from clearbit.com)"
     echo ""
 fi
 
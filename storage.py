@@ -2,43 +2,176 @@
 Data storage and deduplication for scraped businesses
 """
 
+import io
 import json
 import csv
+import operator
 import os
-from typing import List, Set, Dict, Optional
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from typing import List, Set, Dict, Iterator, Optional
 from datetime import datetime
 from pathlib import Path
+from urllib.parse import urlsplit
 
-import pandas as pd
+from openpyxl import Workbook
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Fall back to parsing the whole file at once
+    ijson = None
 
 from models import Business
 
 
+# Column order of the CSV/Excel exports (the Business field order)
+_ROW_FIELDNAMES = (
+    'place_id', 'name', 'address', 'phone', 'website', 'email', 'emails',
+    'rating', 'review_count', 'category', 'latitude', 'longitude', 'hours',
+    'photos', 'description', 'social_media', 'scraped_at',
+)
+# Fetches every column's attribute from a Business in one C-level call
+_ROW_GETTER = operator.attrgetter(*_ROW_FIELDNAMES)
+
+
+def _shard_of(place_id: str) -> str:
+    """Two-hex-digit shard name for a place_id (stable across runs, unlike hash())"""
+    return f"{zlib.crc32(place_id.encode()) & 0xff:02x}"
+
+
+def _norm_website(website: str) -> str:
+    """Reduce a website URL to its lowercase bare domain (no scheme, path or www.)"""
+    parts = urlsplit(website.strip().lower())
+    domain = parts.netloc or parts.path.split('/', 1)[0]
+    return domain.removeprefix('www.')
+
+
+def _json_default(obj):
+    if isinstance(obj, datetime):
+        return obj.isoformat()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _dump_json(businesses: List[Business]) -> bytes:
+    """Serialize businesses with hours/photos/social_media kept as native JSON"""
+    if orjson is not None:
+        # orjson serializes the dataclasses and datetimes itself
+        return orjson.dumps(businesses, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS)
+    data = [asdict(b) for b in businesses]
+    return json.dumps(data, indent=2, ensure_ascii=False, default=_json_default).encode('utf-8')
+
+
+def _dump_json_line(business: Business) -> bytes:
+    """One compact JSON line for the incremental JSONL journal"""
+    if orjson is not None:
+        return orjson.dumps(business, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    line = json.dumps(asdict(business), ensure_ascii=False, default=_json_default)
+    return f"{line}\n".encode('utf-8')
+
+
+def _load_json(data: bytes):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _iter_json_items(file_path: Path) -> Iterator[dict]:
+    """Yield the objects of a top-level JSON array, streaming them when ijson is available"""
+    if ijson is not None:
+        with open(file_path, 'rb') as f:
+            yield from ijson.items(f, 'item', use_float=True)
+    else:
+        yield from _load_json(file_path.read_bytes())
+
+
 class StreamingCSVWriter:
-    """Write businesses to a single CSV file as they come in"""
+    """
+    Write businesses to a single CSV file as they come in
+    Rows are formatted into a buffer written out every buffer_rows appends or on flush();
+    updated rows are journalled to a sidecar file and folded in by close()
+    """
     
-    def __init__(self, filepath: str, fieldnames: List[str]):
+    def __init__(
+        self,
+        filepath: str,
+        fieldnames: List[str],
+        fsync_every: Optional[int] = None,
+        buffer_rows: int = 256
+    ):
+        """
+        fsync_every: fsync the CSV after this many appends (None leaves it to the OS)
+        buffer_rows: appends held in memory between writes to the file
+        """
         self.filepath = Path(filepath)
-        self.fieldnames = fieldnames
+        self.fieldnames = tuple(fieldnames)
         self.filepath.parent.mkdir(parents=True, exist_ok=True)
         self._place_id_index: Dict[str, int] = {}  # Track row positions
         self._rows: List[dict] = []  # Keep in-memory copy for updates
+        self._updates_path = self.filepath.with_name(f"{self.filepath.stem}.updates.csv")
+        self._fsync_every = fsync_every
+        self._since_fsync = 0
+        self._buffer_rows = buffer_rows
+        self._buffered = 0
         
-        # Create file with headers
-        with open(self.filepath, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
+        # One handle for the writer's lifetime; rows are formatted into an
+        # in-memory buffer and reach the file in one write per batch
+        self._fh = open(self.filepath, 'w', newline='', encoding='utf-8', buffering=1 << 16)
+        self._buf = io.StringIO()
+        # extrasaction='ignore': only write fields that exist in our headers
+        self._writer = csv.DictWriter(self._buf, fieldnames=self.fieldnames, extrasaction='ignore')
+        self._writer.writeheader()
+        self.flush()
+        self._updates_fh = None
+        self._updates_writer = None
+        
+        # A journal left over from an earlier run belongs to the file just truncated
+        if self._updates_path.exists():
+            self._updates_path.unlink()
     
     def append(self, business_dict: dict):
         """Append a single business to the CSV"""
         self._rows.append(business_dict)
         self._place_id_index[business_dict['place_id']] = len(self._rows) - 1
+        self._writer.writerow(business_dict)
+        self._wrote(1)
+    
+    def append_many(self, business_dicts: List[dict]):
+        """Append several businesses to the CSV in one batch"""
+        start = len(self._rows)
+        self._rows.extend(business_dicts)
+        for idx, business_dict in enumerate(business_dicts, start):
+            self._place_id_index[business_dict['place_id']] = idx
+        self._writer.writerows(business_dicts)
+        self._wrote(len(business_dicts))
+    
+    def _wrote(self, count: int):
+        """Account for count buffered rows, flushing/fsyncing when a threshold is reached"""
+        self._buffered += count
         
-        with open(self.filepath, 'a', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-            # Only write fields that exist in our headers
-            row = {k: v for k, v in business_dict.items() if k in self.fieldnames}
-            writer.writerow(row)
+        if self._fsync_every:
+            self._since_fsync += count
+            if self._since_fsync >= self._fsync_every:
+                self.flush()
+                os.fsync(self._fh.fileno())
+                self._since_fsync = 0
+        
+        if self._buffered >= self._buffer_rows:
+            self.flush()
+    
+    def flush(self):
+        """Write buffered rows out to the file"""
+        if self._buf.tell():
+            self._fh.write(self._buf.getvalue())
+            self._buf.seek(0)
+            self._buf.truncate()
+        self._fh.flush()
+        self._buffered = 0
     
     def update_row(self, business_dict: dict):
         """Update an existing row with new data (e.g., enriched email)"""
@@ -46,14 +179,43 @@ class StreamingCSVWriter:
         if place_id and place_id in self._place_id_index:
             # Update in-memory
             idx = self._place_id_index[place_id]
-            self._rows[idx].update(business_dict)
+            row = self._rows[idx]
+            row.update(business_dict)
             
-            # Rewrite entire CSV
-            with open(self.filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=self.fieldnames)
-                writer.writeheader()
-                for row in self._rows:
-                    writer.writerow({k: v for k, v in row.items() if k in self.fieldnames})
+            # Journal the updated row; the last entry per place_id wins
+            if self._updates_writer is None:
+                self._updates_fh = open(self._updates_path, 'w', newline='', encoding='utf-8', buffering=1)
+                self._updates_writer = csv.DictWriter(self._updates_fh, fieldnames=self.fieldnames, extrasaction='ignore')
+                self._updates_writer.writeheader()
+            self._updates_writer.writerow(row)
+    
+    def close(self):
+        """Close the file, folding journalled updates into the CSV with a single rewrite"""
+        if self._fh is None:
+            return
+        self.flush()
+        self._fh.close()
+        self._fh = None
+        
+        if self._updates_fh is None:
+            return
+        self._updates_fh.close()
+        
+        # Project rows onto the header with the plain C writer; missing fields are blank
+        fieldnames = self.fieldnames
+        with open(self.filepath, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(fieldnames)
+            writer.writerows([row.get(k, '') for k in fieldnames] for row in self._rows)
+        self._updates_path.unlink()
+        self._updates_fh = None
+        self._updates_writer = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
     
     def get_path(self) -> str:
         """Get the file path"""
@@ -68,7 +230,11 @@ class BusinessStore:
         self.output_dir.mkdir(exist_ok=True)
         
         self.businesses: Dict[str, Business] = {}
-        self._place_ids: Set[str] = set()
+        self._dirty: Set[str] = set()  # Added/updated since the last save
+        self._shard_members: Dict[str, Set[str]] = {}  # Shard name -> place_ids
+        self._dirty_shards: Set[str] = set()  # latest/ shards to rewrite on the next full save
+        self._shards_written = False  # First full save rewrites every shard
+        self._website_index: Dict[str, str] = {}  # Normalized domain -> place_id
         
         # Load existing data if available
         self._load_existing()
@@ -78,12 +244,14 @@ class BusinessStore:
         json_file = self.output_dir / "businesses.json"
         if json_file.exists():
             try:
-                with open(json_file, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    for item in data:
-                        business = Business(**item)
-                        self._place_ids.add(business.place_id)
-                        self.businesses[business.place_id] = business
+                # One record in memory at a time rather than the whole parsed file
+                for item in _iter_json_items(json_file):
+                    if isinstance(item.get('scraped_at'), str):
+                        item['scraped_at'] = datetime.fromisoformat(item['scraped_at'])
+                    business = Business(**item)
+                    self.businesses[business.place_id] = business
+                    self._index_website(business)
+                    self._track_shard(business.place_id)
                 print(f"Loaded {len(self.businesses)} existing businesses")
             except Exception as e:
                 print(f"Error loading existing data: {e}")
@@ -93,11 +261,15 @@ class BusinessStore:
         Add a business to the store
         Returns True if added, False if duplicate
         """
-        if business.place_id in self._place_ids:
+        if business.place_id in self.businesses:
             return False
         
-        self._place_ids.add(business.place_id)
+        if business.scraped_at is None:
+            business.scraped_at = datetime.now()
         self.businesses[business.place_id] = business
+        self._dirty.add(business.place_id)
+        self._dirty_shards.add(self._track_shard(business.place_id))
+        self._index_website(business)
         return True
     
     def add_many(self, businesses: List[Business]) -> int:
@@ -106,9 +278,14 @@ class BusinessStore:
         Returns count of newly added businesses
         """
         added = 0
+        now = datetime.now()  # One stamp for the whole batch
         for business in businesses:
-            if self.add(business):
-                added += 1
+            if business.place_id in self.businesses:
+                continue
+            if business.scraped_at is None:
+                business.scraped_at = now
+            self.add(business)
+            added += 1
         return added
     
     def get(self, place_id: str) -> Optional[Business]:
@@ -117,95 +294,149 @@ class BusinessStore:
     
     def update(self, business: Business):
         """Update existing business"""
-        if business.place_id in self._place_ids:
+        if business.place_id in self.businesses:
             self.businesses[business.place_id] = business
+            self._dirty.add(business.place_id)
+            self._dirty_shards.add(_shard_of(business.place_id))
+            self._index_website(business)
+    
+    def _track_shard(self, place_id: str) -> str:
+        """Record which latest/ shard place_id lives in"""
+        shard = _shard_of(place_id)
+        self._shard_members.setdefault(shard, set()).add(place_id)
+        return shard
+    
+    def _index_website(self, business: Business):
+        """Point the business's domain at it (the first business seen keeps a shared domain)"""
+        if business.website:
+            self._website_index.setdefault(_norm_website(business.website), business.place_id)
     
     def exists(self, place_id: str) -> bool:
         """Check if business already exists"""
-        return place_id in self._place_ids
+        return place_id in self.businesses
     
     def get_all(self) -> List[Business]:
         """Get all businesses"""
         return list(self.businesses.values())
     
     def get_by_website(self, website: str) -> Optional[Business]:
-        """Find business by website"""
-        for business in self.businesses.values():
-            if business.website and website in business.website:
-                return business
-        return None
-    
-    def save(self):
-        """Save all data to files"""
+        """Find business by website (matched on domain)"""
+        place_id = self._website_index.get(_norm_website(website))
+        return self.businesses.get(place_id) if place_id else None
+    
+    def save(self, force: bool = False):
+        """
+        Save data to files
+        Without force only new/updated businesses are appended to businesses_latest.jsonl;
+        force writes the full JSON/CSV/Excel snapshots (end of a run), with the latest
+        JSON split into latest/shard_XX.json files of which only changed ones are rewritten
+        """
+        if not force:
+            self._append_jsonl_latest()
+            return
+        
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        # Save as JSON
-        self._save_json(timestamp)
+        # Convert once; every CSV/Excel write shares the same flat rows
+        businesses = list(self.businesses.values())
+        rows = [self._business_to_dict(b) for b in businesses]
         
-        # Save as CSV
-        self._save_csv(timestamp)
+        # The six writes are independent; overlap their file I/O. The store
+        # must not be modified until save() returns
+        with ThreadPoolExecutor(max_workers=3) as pool:
+            futures = [
+                pool.submit(self._save_json, timestamp, businesses),
+                pool.submit(self._save_csv, timestamp, rows),
+                pool.submit(self._save_excel, timestamp, rows),
+                # Update latest files
+                pool.submit(self._save_latest_shards),
+                pool.submit(self._save_csv, "latest", rows),
+                pool.submit(self._save_excel, "latest", rows),
+            ]
+            for future in futures:
+                future.result()  # Re-raise any write error
         
-        # Save as Excel
-        self._save_excel(timestamp)
+        # The snapshots now hold everything the journal did
+        self._dirty.clear()
+        jsonl_path = self.output_dir / "businesses_latest.jsonl"
+        if jsonl_path.exists():
+            jsonl_path.unlink()
+    
+    def _append_jsonl_latest(self):
+        """Append businesses changed since the last save, one JSON line each (last line per place_id wins)"""
+        if not self._dirty:
+            return
         
-        # Update latest files
-        self._save_json("latest")
-        self._save_csv("latest")
-        self._save_excel("latest")
+        with open(self.output_dir / "businesses_latest.jsonl", 'ab') as f:
+            for place_id in self._dirty:
+                f.write(_dump_json_line(self.businesses[place_id]))
+        self._dirty.clear()
     
     def _business_to_dict(self, business: Business) -> dict:
-        """Convert business to dictionary"""
-        return {
-            'place_id': business.place_id,
-            'name': business.name,
-            'address': business.address,
-            'phone': business.phone,
-            'website': business.website,
-            'email': business.email,
-            'emails': business.emails,
-            'rating': business.rating,
-            'review_count': business.review_count,
-            'category': business.category,
-            'latitude': business.latitude,
-            'longitude': business.longitude,
-            'hours': json.dumps(business.hours) if business.hours else None,
-            'photos': json.dumps(business.photos) if business.photos else None,
-            'description': business.description,
-            'social_media': json.dumps(business.social_media) if business.social_media else None,
-            'scraped_at': business.scraped_at.isoformat()
-        }
+        """
+        Convert business to a flat dictionary for CSV/Excel rows (keys in _ROW_FIELDNAMES order)
+        JSON output skips this and serializes the Business itself
+        """
+        row = dict(zip(_ROW_FIELDNAMES, _ROW_GETTER(business)))
+        row['hours'] = json.dumps(row['hours']) if row['hours'] else None
+        row['photos'] = json.dumps(row['photos']) if row['photos'] else None
+        row['social_media'] = json.dumps(row['social_media']) if row['social_media'] else None
+        row['scraped_at'] = row['scraped_at'].isoformat() if row['scraped_at'] else None
+        return row
     
-    def _save_json(self, suffix: str):
+    def _save_json(self, suffix: str, businesses: List[Business]):
         """Save as JSON"""
-        data = [self._business_to_dict(b) for b in self.businesses.values()]
         file_path = self.output_dir / f"businesses_{suffix}.json"
+        file_path.write_bytes(_dump_json(businesses))
+    
+    def _save_latest_shards(self):
+        """Rewrite the latest/ JSON shards holding businesses changed since the last full save"""
+        shard_dir = self.output_dir / "latest"
+        shard_dir.mkdir(exist_ok=True)
+        
+        if not self._shards_written:
+            # Files left by an earlier run may hold businesses this store doesn't
+            self._dirty_shards = {f"{i:02x}" for i in range(256)}
+            self._shards_written = True
         
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f, indent=2, ensure_ascii=False)
+        for shard in self._dirty_shards:
+            file_path = shard_dir / f"shard_{shard}.json"
+            members = self._shard_members.get(shard)
+            if members:
+                file_path.write_bytes(_dump_json([self.businesses[pid] for pid in members]))
+            elif file_path.exists():
+                file_path.unlink()
+        self._dirty_shards.clear()
     
-    def _save_csv(self, suffix: str):
-        """Save as CSV"""
-        if not self.businesses:
+    def _save_csv(self, suffix: str, data: List[dict]):
+        """Save rows from _business_to_dict as CSV"""
+        if not data:
             return
         
-        data = [self._business_to_dict(b) for b in self.businesses.values()]
         file_path = self.output_dir / f"businesses_{suffix}.csv"
         
+        # Rows are already in _ROW_FIELDNAMES order, so the C csv.writer can take
+        # their values directly instead of DictWriter re-keying every row
         with open(file_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=data[0].keys())
-            writer.writeheader()
-            writer.writerows(data)
+            writer = csv.writer(f)
+            writer.writerow(_ROW_FIELDNAMES)
+            writer.writerows(row.values() for row in data)
     
-    def _save_excel(self, suffix: str):
-        """Save as Excel"""
-        if not self.businesses:
+    def _save_excel(self, suffix: str, data: List[dict]):
+        """Save rows from _business_to_dict as Excel"""
+        if not data:
             return
         
-        data = [self._business_to_dict(b) for b in self.businesses.values()]
-        df = pd.DataFrame(data)
-        
         file_path = self.output_dir / f"businesses_{suffix}.xlsx"
-        df.to_excel(file_path, index=False, engine='openpyxl')
+        
+        # write_only streams rows out instead of building a Cell object per value
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('businesses')
+        ws.append(list(_ROW_FIELDNAMES))
+        for row in data:
+            # Cells only take scalars; lists (emails) are written as their repr like the CSV
+            ws.append([str(v) if isinstance(v, list) else v for v in row.values()])
+        wb.save(file_path)
     
     @property
     def count(self) -> int:
@@ -213,19 +444,26 @@ class BusinessStore:
     
     def get_statistics(self) -> dict:
         """Get statistics about collected data"""
-        businesses = list(self.businesses.values())
+        total = len(self.businesses)
         
-        with_website = sum(1 for b in businesses if b.website)
-        with_email = sum(1 for b in businesses if b.email)
-        with_phone = sum(1 for b in businesses if b.phone)
-        with_rating = sum(1 for b in businesses if b.rating)
+        # One pass over the store for all four counters
+        with_website = with_email = with_phone = with_rating = 0
+        for b in self.businesses.values():
+            if b.website:
+                with_website += 1
+            if b.email:
+                with_email += 1
+            if b.phone:
+                with_phone += 1
+            if b.rating:
+                with_rating += 1
         
         return {
-            'total_businesses': len(businesses),
+            'total_businesses': total,
             'with_website': with_website,
             'with_email': with_email,
             'with_phone': with_phone,
             'with_rating': with_rating,
-            'website_coverage': with_website / len(businesses) * 100 if businesses else 0,
-            'email_coverage': with_email / len(businesses) * 100 if businesses else 0,
+            'website_coverage': with_website / total * 100 if total else 0,
+            'email_coverage': with_email / total * 100 if total else 0,
         }
@@ -3,10 +3,68 @@ Tile-based grid system for comprehensive Google Maps coverage
 """
 
 import math
-from typing import List, Generator, Tuple
+from types import MappingProxyType
+from typing import List, Dict, Generator, Tuple, Optional
+
+import numpy as np
+
 from models import Tile, SearchConfig
 
 
+def haversine_distances(lat1: float, lng1: float, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+    """
+    Calculate the great circle distance in kilometers from one point to
+    each of many points on the earth (specified in decimal degrees)
+    """
+    # Convert decimal degrees to radians
+    lat1, lng1 = math.radians(lat1), math.radians(lng1)
+    lats, lngs = np.radians(lats), np.radians(lngs)
+    
+    # Haversine formula, one vector op per step
+    dlat = lats - lat1
+    dlng = lngs - lng1
+    a = np.sin(dlat/2)**2 + math.cos(lat1) * np.cos(lats) * np.sin(dlng/2)**2
+    c = 2 * np.arcsin(np.sqrt(a))
+    r = 6371  # Radius of earth in kilometers
+    return c * r
+
+
+def tile_search_radius_m(
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    cos_lat: Optional[float] = None
+) -> int:
+    """
+    Radius in meters (half the diagonal) of a circle covering the tile
+    cos_lat: cos of the center latitude, if the caller already has it
+    """
+    if cos_lat is None:
+        cos_lat = math.cos(math.radians((min_lat + max_lat) / 2))
+    diagonal_km = math.hypot((max_lat - min_lat) * 111, (max_lng - min_lng) * 111 * cos_lat)
+    return int(diagonal_km * 500)
+
+
+def _make_tile(
+    tile_id: str,
+    min_lat: float,
+    max_lat: float,
+    min_lng: float,
+    max_lng: float,
+    cos_lat: Optional[float] = None
+) -> Tile:
+    """Create a tile with its search radius precomputed"""
+    return Tile(
+        id=tile_id,
+        min_lat=min_lat,
+        max_lat=max_lat,
+        min_lng=min_lng,
+        max_lng=max_lng,
+        search_radius_m=tile_search_radius_m(min_lat, max_lat, min_lng, max_lng, cos_lat)
+    )
+
+
 class TileGrid:
     """Creates and manages geographic tiles for search coverage"""
     
@@ -18,6 +76,13 @@ class TileGrid:
         self.tile_size = tile_size
         self.tiles: List[Tile] = []
         self._tile_map: dict = {}  # For quick lookup
+        self._tile_pos: Dict[str, int] = {}  # Tile id -> index in self.tiles
+        # Regular grid layout for bucket lookups; _n_lng is 0 once the grid is irregular
+        self._origin_lat = 0.0
+        self._origin_lng = 0.0
+        self._step = 0.0
+        self._n_lat = 0
+        self._n_lng = 0
     
     def create_grid(self, config: SearchConfig, overlap: float = 0.1) -> List[Tile]:
         """
@@ -27,39 +92,43 @@ class TileGrid:
             config: Search configuration
             overlap: Overlap ratio (0.0-1.0), default 0.1 = 10% overlap
         """
-        self.tiles = []
-        tile_id = 0
-        
         # Calculate step size with overlap
         step_size = self.tile_size * (1 - overlap)
         
-        lat = config.min_lat
-        while lat < config.max_lat:
-            lng = config.min_lng
-            next_lat = min(lat + self.tile_size, config.max_lat)
-            
-            while lng < config.max_lng:
-                next_lng = min(lng + self.tile_size, config.max_lng)
-                
-                tile = Tile(
-                    id=f"tile_{tile_id}",
-                    min_lat=lat,
-                    max_lat=next_lat,
-                    min_lng=lng,
-                    max_lng=next_lng
-                )
-                
-                self.tiles.append(tile)
-                self._tile_map[tile.id] = tile
-                tile_id += 1
-                
-                lng = min(lng + step_size, config.max_lng)
-                if lng >= config.max_lng:
-                    break
-            
-            lat = min(lat + step_size, config.max_lat)
-            if lat >= config.max_lat:
-                break
+        # Tile origins for every row/column, then both edges clamped to the area
+        lats = np.arange(config.min_lat, config.max_lat, step_size)
+        lngs = np.arange(config.min_lng, config.max_lng, step_size)
+        min_lats, min_lngs = np.meshgrid(lats, lngs, indexing='ij')
+        max_lats = np.minimum(min_lats + self.tile_size, config.max_lat)
+        max_lngs = np.minimum(min_lngs + self.tile_size, config.max_lng)
+        
+        # Same formula as tile_search_radius_m, one cos per row broadcast across its columns
+        row_max_lats = np.minimum(lats + self.tile_size, config.max_lat)
+        cos_lats = np.cos(np.radians((lats + row_max_lats) / 2))[:, None]
+        diagonal_km = np.hypot((max_lats - min_lats) * 111, (max_lngs - min_lngs) * 111 * cos_lats)
+        radii = (diagonal_km * 500).astype(int)
+        
+        self.tiles = [
+            Tile(
+                id=f"tile_{i}",
+                min_lat=a,
+                max_lat=b,
+                min_lng=c,
+                max_lng=d,
+                search_radius_m=r
+            )
+            for i, (a, b, c, d, r) in enumerate(zip(
+                min_lats.ravel().tolist(),
+                max_lats.ravel().tolist(),
+                min_lngs.ravel().tolist(),
+                max_lngs.ravel().tolist(),
+                radii.ravel().tolist()
+            ))
+        ]
+        self._tile_map = {tile.id: tile for tile in self.tiles}
+        self._tile_pos = {tile.id: i for i, tile in enumerate(self.tiles)}
+        self._origin_lat, self._origin_lng, self._step = config.min_lat, config.min_lng, step_size
+        self._n_lat, self._n_lng = len(lats), len(lngs)
         
         return self.tiles
     
@@ -80,12 +149,29 @@ class TileGrid:
     
     def get_tile_for_coordinates(self, lat: float, lng: float) -> Tile:
         """Find which tile contains these coordinates"""
+        if self._n_lng:
+            # Only the few rows/columns whose span can reach the point need checking
+            for i in self._bucket_range(lat, self._origin_lat, self._n_lat):
+                for j in self._bucket_range(lng, self._origin_lng, self._n_lng):
+                    tile = self.tiles[i * self._n_lng + j]
+                    if (tile.min_lat <= lat < tile.max_lat and
+                        tile.min_lng <= lng < tile.max_lng):
+                        return tile
+            return None
+        
         for tile in self.tiles:
             if (tile.min_lat <= lat < tile.max_lat and 
                 tile.min_lng <= lng < tile.max_lng):
                 return tile
         return None
     
+    def _bucket_range(self, value: float, origin: float, count: int) -> range:
+        """Indices of grid rows (or columns) whose tile span may contain value"""
+        # One extra index either side absorbs float rounding; callers re-check bounds
+        lo = math.floor((value - origin - self.tile_size) / self._step)
+        hi = math.floor((value - origin) / self._step) + 1
+        return range(max(lo, 0), min(hi, count - 1) + 1)
+    
     def subdivide_tile(self, tile: Tile) -> List[Tile]:
         """
         Subdivide a tile into 4 smaller tiles
@@ -93,47 +179,74 @@ class TileGrid:
         """
         mid_lat = (tile.min_lat + tile.max_lat) / 2
         mid_lng = (tile.min_lng + tile.max_lng) / 2
+        north_cos = math.cos(math.radians((mid_lat + tile.max_lat) / 2))
+        south_cos = math.cos(math.radians((tile.min_lat + mid_lat) / 2))
         
         new_tiles = [
-            Tile(
-                id=f"{tile.id}_nw",
-                min_lat=mid_lat,
-                max_lat=tile.max_lat,
-                min_lng=tile.min_lng,
-                max_lng=mid_lng
-            ),
-            Tile(
-                id=f"{tile.id}_ne",
-                min_lat=mid_lat,
-                max_lat=tile.max_lat,
-                min_lng=mid_lng,
-                max_lng=tile.max_lng
-            ),
-            Tile(
-                id=f"{tile.id}_sw",
-                min_lat=tile.min_lat,
-                max_lat=mid_lat,
-                min_lng=tile.min_lng,
-                max_lng=mid_lng
-            ),
-            Tile(
-                id=f"{tile.id}_se",
-                min_lat=tile.min_lat,
-                max_lat=mid_lat,
-                min_lng=mid_lng,
-                max_lng=tile.max_lng
-            )
+            _make_tile(f"{tile.id}_nw", mid_lat, tile.max_lat, tile.min_lng, mid_lng, north_cos),
+            _make_tile(f"{tile.id}_ne", mid_lat, tile.max_lat, mid_lng, tile.max_lng, north_cos),
+            _make_tile(f"{tile.id}_sw", tile.min_lat, mid_lat, tile.min_lng, mid_lng, south_cos),
+            _make_tile(f"{tile.id}_se", tile.min_lat, mid_lat, mid_lng, tile.max_lng, south_cos)
         ]
         
-        # Replace old tile with new ones
-        idx = self.tiles.index(tile)
-        self.tiles = self.tiles[:idx] + new_tiles + self.tiles[idx+1:]
+        # Replace old tile with new ones; the grid is no longer regular
+        self._n_lng = 0
+        idx = self._tile_pos.pop(tile.id)
+        self.tiles[idx:idx+1] = new_tiles
         del self._tile_map[tile.id]
-        for t in new_tiles:
+        for k, t in enumerate(new_tiles):
             self._tile_map[t.id] = t
+            self._tile_pos[t.id] = idx + k
+        
+        # Tiles after the split moved along by the extra children
+        shift = len(new_tiles) - 1
+        for t in self.tiles[idx+len(new_tiles):]:
+            self._tile_pos[t.id] += shift
             
         return new_tiles
     
+    def skip_covered_tiles(self, tiles: List[Tile], radius_multiplier: float = 1.0) -> List[Tile]:
+        """
+        Drop tiles whose center already lies inside a kept tile's search circle
+        Largest circles are kept first; returns the kept tiles in their original order
+        radius_multiplier: the api_radius_multiplier the tiles will be searched with
+        """
+        kept: List[Tile] = []
+        kept_lats = np.empty(len(tiles))
+        kept_lngs = np.empty(len(tiles))
+        kept_radii_km = np.empty(len(tiles))
+        
+        for tile in sorted(tiles, key=lambda t: t.search_radius_m, reverse=True):
+            lat, lng = tile.center
+            n = len(kept)
+            if n:
+                distances_km = haversine_distances(lat, lng, kept_lats[:n], kept_lngs[:n])
+                if (distances_km <= kept_radii_km[:n]).any():
+                    continue
+            
+            kept_lats[n], kept_lngs[n] = lat, lng
+            kept_radii_km[n] = min(tile.search_radius_m * radius_multiplier, 50000) / 1000
+            kept.append(tile)
+        
+        kept_ids = {t.id for t in kept}
+        return [t for t in tiles if t.id in kept_ids]
+    
+    def order_by_yield(self, tiles: List[Tile], center: Optional[Tuple[float, float]] = None) -> List[Tile]:
+        """
+        Tiles most likely to turn up businesses first: highest business_count from
+        the previous pass, ties broken by distance of the tile center from center
+        """
+        if not tiles:
+            return []
+        counts = np.fromiter((t.business_count for t in tiles), dtype=float, count=len(tiles))
+        if center is not None:
+            centers = np.array([t.center for t in tiles])
+            distances_km = haversine_distances(center[0], center[1], centers[:, 0], centers[:, 1])
+        else:
+            distances_km = np.zeros(len(tiles))
+        # lexsort keys run last-primary: yield descending, then nearest first
+        return [tiles[i] for i in np.lexsort((distances_km, -counts)).tolist()]
+    
     @property
     def total_tiles(self) -> int:
         return len(self.tiles)
@@ -169,23 +282,25 @@ def calculate_tile_size_for_area(
     return round(tile_size, 4)
 
 
+# Approximate bounds for major cities as (min_lat, max_lat, min_lng, max_lng),
+# keyed by lowercase name with underscores for spaces
+_CITY_BOUNDS = MappingProxyType({
+    "new_york": (40.4774, 40.9176, -74.2591, -73.7004),
+    "los_angeles": (33.7037, 34.3373, -118.6682, -118.1553),
+    "chicago": (41.6445, 42.0230, -87.9401, -87.5241),
+    "houston": (29.5370, 30.1105, -95.9136, -95.0129),
+    "phoenix": (33.2903, 33.9185, -112.3237, -111.7893),
+    "philadelphia": (39.8716, 40.1379, -75.2803, -74.9558),
+    "san_antonio": (29.1927, 29.6281, -98.8096, -98.2208),
+    "san_diego": (32.5349, 33.1146, -117.3090, -116.9085),
+    "dallas": (32.6164, 33.0233, -97.0331, -96.5536),
+    "san_jose": (37.1354, 37.4690, -122.0454, -121.5890),
+})
+
+
 def get_city_bounds(city: str) -> Tuple[float, float, float, float]:
     """
     Get approximate bounds for major cities
     Returns (min_lat, max_lat, min_lng, max_lng)
     """
-    cities = {
-        "new_york": (40.4774, 40.9176, -74.2591, -73.7004),
-        "los_angeles": (33.7037, 34.3373, -118.6682, -118.1553),
-        "chicago": (41.6445, 42.0230, -87.9401, -87.5241),
-        "houston": (29.5370, 30.1105, -95.9136, -95.0129),
-        "phoenix": (33.2903, 33.9185, -112.3237, -111.7893),
-        "philadelphia": (39.8716, 40.1379, -75.2803, -74.9558),
-        "san_antonio": (29.1927, 29.6281, -98.8096, -98.2208),
-        "san_diego": (32.5349, 33.1146, -117.3090, -116.9085),
-        "dallas": (32.6164, 33.0233, -97.0331, -96.5536),
-        "san_jose": (37.1354, 37.4690, -122.0454, -121.5890),
-    }
-    
-    city_key = city.lower().replace(" ", "_")
-    return cities.get(city_key)
+    return _CITY_BOUNDS.get(city.lower().replace(" ", "_"))
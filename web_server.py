@@ -4,31 +4,64 @@ Provides REST API and real-time updates via WebSockets
 """
 
 import asyncio
+import base64
+import concurrent.futures
+import gzip
+import hashlib
 import json
+import logging
 import math
 import os
+import re
 import shutil
+import sys
 import threading
+import time
 import uuid
+from collections import OrderedDict, deque
 from datetime import datetime
-from typing import Dict, Optional, Tuple, Set
-from dataclasses import dataclass, asdict
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass, asdict, field
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener
+from queue import SimpleQueue
 
 import requests
-from flask import Flask, render_template, jsonify, request
-from flask_socketio import SocketIO, emit
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from flask import Flask, Response, render_template, jsonify, request, stream_with_context
+from flask.json.provider import DefaultJSONProvider
+from flask_socketio import SocketIO, emit, join_room
 from flask_cors import CORS
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
 from models import SearchConfig, Business, Tile
 from tile_grid import TileGrid, get_city_bounds
-from scraper import GoogleMapsScraper, ScrapingConfig
+from scraper import GoogleMapsScraper, ScrapingConfig, new_places_session
 from email_enricher import EmailEnricher
 from storage import BusinessStore
+from api_cache import APIResponseCache
+
+try:
+    import orjson
+except ImportError:  # Fall back to stdlib json
+    orjson = None
+
+try:
+    import uvloop
+except ImportError:  # Jobs run on the stdlib event loop
+    uvloop = None
 
 load_dotenv()
 
+logger = logging.getLogger(__name__)
+
+# Settings read once at import rather than on every request
+GOOGLE_MAPS_API_KEY = os.getenv('GOOGLE_MAPS_API_KEY')
+RATE_LIMIT_DELAY = float(os.getenv('RATE_LIMIT_DELAY', 0.1))
+PLACES_COUNTRY = os.getenv('PLACES_COUNTRY', 'au')  # Autocomplete country bias
+
 # Initialize Supabase client
 supabase_url = os.getenv('SUPABASE_URL')
 supabase_key = os.getenv('SUPABASE_KEY')
@@ -40,13 +73,217 @@ if supabase_url and supabase_key:
     except Exception as e:
         print(f"✗ Supabase connection failed: {e}")
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """jsonify() through orjson; the job results endpoints return every business"""
+    option = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY if orjson is not None else 0
+    
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, default=self.default, option=self.option).decode()
+    
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+    
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(
+            orjson.dumps(obj, default=self.default, option=self.option),
+            mimetype=self.mimetype
+        )
+
+
+class OrjsonSocketJSON:
+    """json-module stand-in for Socket.IO packets; emits run outside any app context"""
+    
+    @staticmethod
+    def dumps(obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=OrjsonProvider.option).decode()
+    
+    @staticmethod
+    def loads(s, **kwargs):
+        return orjson.loads(s)
+
+
 app = Flask(__name__)
+if orjson is not None:
+    app.json = OrjsonProvider(app)
 app.config['SECRET_KEY'] = os.getenv('SECRET_KEY', 'dev-secret-key')
 CORS(app)
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading')
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode='threading',
+    compression_threshold=256,  # Gzip long-polling payloads above this many bytes (engine.io default 1024)
+    **({'json': OrjsonSocketJSON} if orjson is not None else {})
+)
+
+
+def job_room(job_id: str) -> str:
+    """Socket.IO room of the clients following a job"""
+    return f"job:{job_id}"
+
+
+class JobChannel:
+    """Stands in for socketio in code that emits per-job events without knowing about rooms"""
+    
+    def __init__(self, job_id: str):
+        self.room = job_room(job_id)
+    
+    def emit(self, event: str, data=None):
+        socketio.emit(event, data, to=self.room)
+
+
+class RateLimitedEmitter:
+    """Token bucket: allow() spends a token, refilled at refill_per_sec up to capacity"""
+    
+    def __init__(self, capacity: int = 20, refill_per_sec: float = 10):
+        self.capacity = capacity
+        self.refill_per_sec = refill_per_sec
+        self.tokens = float(capacity)
+        self.stamp = time.monotonic()
+        self.dropped = 0  # Denied since the last allowed call
+    
+    def allow(self) -> bool:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.stamp) * self.refill_per_sec)
+        self.stamp = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        self.dropped += 1
+        return False
+
+
+class EmitBatcher:
+    """
+    Coalesces high-frequency per-job events (businesses_found_batch, log_message and the
+    enrichment updates) into one 'events_batch' emit every interval seconds, at
+    most max_batch events each; a job with max_pending queued events is flushed
+    by the pushing caller itself, so a burst cannot outrun the flusher unbounded
+    Debug-level log_message events pass a per-job RateLimitedEmitter; the ones it
+    denies are summed into a single line ahead of the next debug message let through
+    """
+    
+    def __init__(self, interval: float = 0.1, max_batch: int = 128, max_pending: int = 512):
+        self.interval = interval
+        self.max_batch = max_batch
+        self.max_pending = max_pending
+        self._queues: Dict[str, deque] = {}
+        self._limiters: Dict[str, RateLimitedEmitter] = {}
+        self._lock = threading.Lock()  # Guards _queues, _limiters and starting the flusher
+        self._flush_lock = threading.Lock()  # One flusher at a time keeps batches in order
+        self._task = None
+    
+    def push(self, job_id: str, event_type: str, data: dict):
+        """
+        Queue an event for the job's next batch
+        data's job_id key is dropped; the batch carries it once for all its events
+        """
+        data.pop('job_id', None)
+        with self._lock:
+            if event_type == 'log_message' and data.get('level') == 'debug':
+                limiter = self._limiters.get(job_id)
+                if limiter is None:
+                    limiter = self._limiters[job_id] = RateLimitedEmitter()
+                if not limiter.allow():
+                    return
+            else:
+                limiter = None
+            queue = self._queues.setdefault(job_id, deque())
+            if limiter is not None and limiter.dropped:
+                queue.append({'type': 'log_message', 'data': {
+                    'message': f'({limiter.dropped} debug messages skipped)',
+                    'level': 'debug',
+                    'dropped': limiter.dropped,
+                }})
+                limiter.dropped = 0
+            queue.append({'type': event_type, 'data': data})
+            full = len(queue) >= self.max_pending
+            if self._task is None:
+                self._task = socketio.start_background_task(self._run)
+        if full:
+            self.flush(job_id)
+    
+    def flush(self, job_id: Optional[str] = None):
+        """Emit everything queued for job_id (or every job) right away"""
+        with self._flush_lock:
+            with self._lock:
+                job_ids = [job_id] if job_id else list(self._queues)
+                queues = [(jid, self._queues.pop(jid, None)) for jid in job_ids]
+            
+            for jid, queue in queues:
+                while queue:
+                    events = [queue.popleft() for _ in range(min(len(queue), self.max_batch))]
+                    socketio.emit('events_batch', {'job_id': jid, 'events': events}, to=job_room(jid))
+    
+    def forget(self, job_id: str):
+        """Drop a removed job's rate limiter"""
+        with self._lock:
+            self._limiters.pop(job_id, None)
+    
+    def _run(self):
+        while True:
+            socketio.sleep(self.interval)
+            self.flush()
+
+
+emit_batcher = EmitBatcher()
+
+
+# One event loop, in one daemon thread, runs every job's coroutines
+_job_loop: Optional[asyncio.AbstractEventLoop] = None
+_job_loop_lock = threading.Lock()
+
+
+def get_job_loop() -> asyncio.AbstractEventLoop:
+    """Get the shared job event loop, starting it on first use"""
+    global _job_loop
+    with _job_loop_lock:
+        if _job_loop is None:
+            loop = uvloop.new_event_loop() if uvloop is not None else asyncio.new_event_loop()
+            # aiohttp resolves DNS in the default executor; every job's lookups share this one
+            loop.set_default_executor(concurrent.futures.ThreadPoolExecutor(
+                max_workers=int(os.getenv('THREAD_POOL_SIZE', 64)),
+                thread_name_prefix='job-loop-io'
+            ))
+            threading.Thread(target=loop.run_forever, name='job-loop', daemon=True).start()
+            _job_loop = loop
+    return _job_loop
+
+
+def submit_job(coro) -> concurrent.futures.Future:
+    """Schedule a coroutine on the shared job loop from any thread"""
+    return asyncio.run_coroutine_threadsafe(coro, get_job_loop())
+
+
+# Jobs running at once on the job loop; later ones wait for a free slot
+MAX_CONCURRENT_JOBS = int(os.getenv('MAX_CONCURRENT_JOBS', 4))
+_job_slots = asyncio.Semaphore(MAX_CONCURRENT_JOBS)
+
+
+async def run_limited(func, *args):
+    """Await func(*args) once a job slot is free; cancelling meanwhile never starts it"""
+    async with _job_slots:
+        return await func(*args)
+
+
+_places_session = None  # Opened on the job loop by the first scrape job
+
+
+def get_places_session():
+    """Places API connection pool shared by every job; call from the job loop"""
+    global _places_session
+    if _places_session is None or _places_session.closed:
+        _places_session = new_places_session()
+    return _places_session
+
+
+# Jobs kept in memory; beyond this the oldest finished ones are dropped
+MAX_JOBS = 100
+
 
 # Store active jobs
-@dataclass
+@dataclass(slots=True)
 class ScrapingJob:
     id: str
     query: str
@@ -59,8 +296,31 @@ class ScrapingJob:
     error: Optional[str] = None
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
+    biz_index: Dict[str, dict] = field(default_factory=dict, repr=False)  # place_id -> row in businesses
+    # Last to_dict() result and the field values it was built from
+    _dict_key: Optional[tuple] = field(default=None, init=False, repr=False, compare=False)
+    _dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
     
     def to_dict(self):
+        """Summary sent with every progress update; rebuilt only when a field changes"""
+        key = (self.status, self.current_count, self.target_count, self.tiles_total,
+               self.tiles_completed, self.error, self.started_at, self.completed_at)
+        if key != self._dict_key:
+            self._dict = self._build_dict()
+            self._dict_key = key
+        return self._dict
+    
+    def progress_delta(self) -> dict:
+        """The fields a progress_update changes; the full to_dict() goes with lifecycle events"""
+        return {
+            'job_id': self.id,
+            'current_count': self.current_count,
+            'target_count': self.target_count,
+            'tiles_completed': self.tiles_completed,
+            'progress_percent': round((self.current_count / self.target_count) * 100, 1) if self.target_count > 0 else 0
+        }
+    
+    def _build_dict(self) -> dict:
         return {
             'id': self.id,
             'query': self.query,
@@ -77,12 +337,14 @@ class ScrapingJob:
 
 
 class JobManager:
-    """Manages scraping jobs"""
+    """Manages scraping jobs; safe to call from request threads and the job loop"""
     
-    def __init__(self):
-        self.jobs: Dict[str, ScrapingJob] = {}
-        self.active_jobs: Dict[str, threading.Thread] = {}
-        self._stop_flags: Dict[str, bool] = {}
+    def __init__(self, max_jobs: int = MAX_JOBS):
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, ScrapingJob]" = OrderedDict()  # Oldest first
+        self.active_jobs: Dict[str, concurrent.futures.Future] = {}
+        self._stop_flags: Dict[str, threading.Event] = {}  # Set once a stop is requested
+        self._lock = threading.Lock()  # Guards the three dicts above
     
     def create_job(self, query: str, target_count: int) -> ScrapingJob:
         """Create a new scraping job"""
@@ -97,36 +359,84 @@ class JobManager:
             tiles_completed=0,
             businesses=[]
         )
-        self.jobs[job_id] = job
-        self._stop_flags[job_id] = False
+        with self._lock:
+            self.jobs[job_id] = job
+            self._stop_flags[job_id] = threading.Event()
+            self._evict_finished(keep=job_id)
         return job
     
+    def start_job(self, job_id: str, future: concurrent.futures.Future):
+        """Track a job's running future until it finishes"""
+        def finished(_):
+            with self._lock:
+                if self.active_jobs.get(job_id) is future:
+                    del self.active_jobs[job_id]
+        
+        with self._lock:
+            self.active_jobs[job_id] = future
+        future.add_done_callback(finished)
+    
+    def _evict_finished(self, keep: str):
+        """Drop the oldest finished jobs beyond max_jobs; their CSV stays on disk"""
+        excess = len(self.jobs) - self.max_jobs
+        if excess <= 0:
+            return
+        # keep is the job just created, which has no future yet
+        idle = [jid for jid in self.jobs if jid not in self.active_jobs and jid != keep]
+        for job_id in idle[:excess]:
+            job = self.jobs.pop(job_id)
+            job.businesses = []  # Release the rows even if a caller still holds the job
+            job.biz_index = {}
+            self._stop_flags.pop(job_id, None)
+            emit_batcher.forget(job_id)
+    
     def get_job(self, job_id: str) -> Optional[ScrapingJob]:
         return self.jobs.get(job_id)
     
     def stop_job(self, job_id: str):
         """Signal a job to stop"""
-        self._stop_flags[job_id] = True
-        if job_id in self.jobs:
-            self.jobs[job_id].status = 'paused'
+        with self._lock:
+            self._stop_flags.setdefault(job_id, threading.Event()).set()
+            job = self.jobs.get(job_id)
+        if job:
+            job.status = 'paused'
     
     def should_stop(self, job_id: str) -> bool:
-        return self._stop_flags.get(job_id, False)
+        flag = self._stop_flags.get(job_id)
+        return flag is not None and flag.is_set()
     
     def delete_job(self, job_id: str):
         """Delete a job and stop if running"""
         self.stop_job(job_id)
-        if job_id in self.active_jobs:
-            del self.active_jobs[job_id]
-        if job_id in self.jobs:
-            del self.jobs[job_id]
+        with self._lock:
+            future = self.active_jobs.pop(job_id, None)
+            self.jobs.pop(job_id, None)
+        emit_batcher.forget(job_id)
+        if future is not None:
+            # A deleted job needs no wind-down, so its task is cancelled outright
+            future.cancel()
     
     def get_all_jobs(self) -> list:
-        return [job.to_dict() for job in self.jobs.values()]
+        with self._lock:
+            jobs = list(self.jobs.values())
+        return [job.to_dict() for job in jobs]
 
 
 job_manager = JobManager()
 
+# Autocomplete/details and tile search responses, shared by requests and scrape jobs
+places_cache = APIResponseCache()
+AUTOCOMPLETE_CACHE_SECONDS = 3600  # Suggestions for a prefix rarely change within the hour
+
+# Keep-alive pool for the Places endpoints, so a cache miss does not pay a new TLS handshake;
+# brief gateway errors are retried on the pooled connection instead of failing the keystroke
+places_http = requests.Session()
+places_http.mount('https://', HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=64,
+    max_retries=Retry(total=2, backoff_factor=0.2, status_forcelist=(502, 503, 504))
+))
+
 
 @app.route('/')
 def index():
@@ -138,7 +448,7 @@ def index():
 def places_autocomplete():
     """Google Places API autocomplete for location search"""
     query = request.args.get('q', '')
-    api_key = os.getenv('GOOGLE_MAPS_API_KEY')
+    api_key = GOOGLE_MAPS_API_KEY
     
     if not api_key:
         return jsonify({'error': 'GOOGLE_MAPS_API_KEY not configured'}), 500
@@ -152,39 +462,58 @@ def places_autocomplete():
             'input': query,
             'key': api_key,
             'language': 'en',
-            'components': 'country:au'  # Bias to Australia based on user location
+            'components': f'country:{PLACES_COUNTRY}'  # Bias to Australia by default, based on user location
         }
         
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
-        
-        if data.get('status') not in ['OK', 'ZERO_RESULTS']:
-            return jsonify({'error': data.get('status', 'Unknown error')}), 400
-        
-        predictions = []
-        for place in data.get('predictions', []):
-            # Extract main text and secondary text safely
-            structured = place.get('structured_formatting', {})
-            main_text = structured.get('main_text', place.get('description', '').split(',')[0])
-            secondary_text = structured.get('secondary_text', ', '.join(place.get('description', '').split(',')[1:]))
+        # Keystrokes repeat ("syd", "sydn", ...), so key on the normalized input
+        cache_key = places_cache.make_key(url, {**params, 'input': query.strip().lower()})
+        data = places_cache.get_by_key(cache_key, max_age=AUTOCOMPLETE_CACHE_SECONDS)
+        if data is None:
+            response = places_http.get(url, params=params, timeout=10)
+            data = orjson.loads(response.content) if orjson is not None else response.json()
             
-            predictions.append({
-                'place_id': place['place_id'],
-                'description': place['description'],
-                'main_text': main_text,
-                'secondary_text': secondary_text
-            })
+            if data.get('status') not in ('OK', 'ZERO_RESULTS'):
+                return jsonify({'error': data.get('status', 'Unknown error')}), 400
+            places_cache.put_by_key(cache_key, url, data)
         
-        return jsonify({'predictions': predictions})
+        response = jsonify({'predictions': [_format_prediction(place) for place in data.get('predictions', ())]})
+        # Browsers reuse suggestions for a prefix typed again within ten minutes
+        response.headers['Cache-Control'] = 'private, max-age=600'
+        return response
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+# Separator of "main, secondary" descriptions and "lat,lng,lat,lng" bounds
+_COMMA_RE = re.compile(r'\s*,\s*')
+
+
+def _format_prediction(place: dict) -> dict:
+    """Reduce an autocomplete prediction to the fields the location search shows"""
+    description = place['description']
+    structured = place.get('structured_formatting')
+    if structured and 'main_text' in structured and 'secondary_text' in structured:
+        main_text, secondary_text = structured['main_text'], structured['secondary_text']
+    else:
+        # Only split the description when Google left a part out
+        structured = structured or {}
+        parts = _COMMA_RE.split(description, maxsplit=1)
+        main_text = structured.get('main_text', parts[0])
+        secondary_text = structured.get('secondary_text', parts[1] if len(parts) > 1 else '')
+    
+    return {
+        'place_id': place['place_id'],
+        'description': description,
+        'main_text': main_text,
+        'secondary_text': secondary_text
+    }
+
+
 @app.route('/api/places/details/<place_id>')
 def place_details(place_id):
     """Get place details including coordinates"""
-    api_key = os.getenv('GOOGLE_MAPS_API_KEY')
+    api_key = GOOGLE_MAPS_API_KEY
     
     if not api_key:
         return jsonify({'error': 'GOOGLE_MAPS_API_KEY not configured'}), 500
@@ -197,11 +526,16 @@ def place_details(place_id):
             'fields': 'geometry,name,formatted_address'
         }
         
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
-        
-        if data.get('status') != 'OK':
-            return jsonify({'error': data.get('status', 'Unknown error')}), 400
+        # Geometry is stable; the cache's default 24h TTL applies
+        cache_key = places_cache.make_key(url, params)
+        data = places_cache.get_by_key(cache_key)
+        if data is None:
+            response = places_http.get(url, params=params, timeout=10)
+            data = response.json()
+            
+            if data.get('status') != 'OK':
+                return jsonify({'error': data.get('status', 'Unknown error')}), 400
+            places_cache.put_by_key(cache_key, url, data)
         
         result = data.get('result', {})
         geometry = result.get('geometry', {})
@@ -226,22 +560,30 @@ def place_details(place_id):
         return jsonify({'error': str(e)}), 500
 
 
+# The city list is fixed, so its body and ETag are built once
+_CITIES = {
+    'new_york': 'New York',
+    'los_angeles': 'Los Angeles',
+    'chicago': 'Chicago',
+    'houston': 'Houston',
+    'phoenix': 'Phoenix',
+    'philadelphia': 'Philadelphia',
+    'san_antonio': 'San Antonio',
+    'san_diego': 'San Diego',
+    'dallas': 'Dallas',
+    'san_jose': 'San Jose'
+}
+_CITIES_JSON = json.dumps(_CITIES).encode('utf-8')
+_CITIES_ETAG = hashlib.md5(_CITIES_JSON).hexdigest()
+
+
 @app.route('/api/cities')
 def get_cities():
     """Get list of available cities"""
-    cities = {
-        'new_york': 'New York',
-        'los_angeles': 'Los Angeles',
-        'chicago': 'Chicago',
-        'houston': 'Houston',
-        'phoenix': 'Phoenix',
-        'philadelphia': 'Philadelphia',
-        'san_antonio': 'San Antonio',
-        'san_diego': 'San Diego',
-        'dallas': 'Dallas',
-        'san_jose': 'San Jose'
-    }
-    return jsonify(cities)
+    response = Response(_CITIES_JSON, mimetype='application/json')
+    response.headers['Cache-Control'] = 'public, max-age=86400'
+    response.set_etag(_CITIES_ETAG)
+    return response.make_conditional(request)
 
 
 @app.route('/api/jobs', methods=['GET'])
@@ -264,10 +606,8 @@ def get_job_results(job_id):
     """Get job results"""
     job = job_manager.get_job(job_id)
     if job:
-        return jsonify({
-            'job': job.to_dict(),
-            'businesses': job.businesses
-        })
+        # Same document as the JSON export, streamed rather than built whole
+        return Response(stream_with_context(_iter_export_json(job)), mimetype='application/json')
     return jsonify({'error': 'Job not found'}), 404
 
 
@@ -292,20 +632,59 @@ def export_job(job_id, format):
                 csv_path,
                 mimetype='text/csv',
                 as_attachment=True,
-                download_name=f'{job.query}_results_{job_id}.csv'
+                download_name=f'{job.query}_results_{job_id}.csv',
+                conditional=True  # ETag and Last-Modified come from the file's mtime and size
             )
         else:
             return jsonify({'error': 'CSV file not found'}), 404
     
     elif format == 'json':
-        return jsonify({
-            'job': job.to_dict(),
-            'businesses': job.businesses
-        })
+        return Response(
+            stream_with_context(_iter_export_json(job)),
+            mimetype='application/json'
+        )
     
     return jsonify({'error': 'Invalid format'}), 400
 
 
+# Businesses serialized per chunk of the streamed JSON export
+EXPORT_CHUNK_SIZE = 500
+
+
+def _dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode('utf-8')
+
+
+def _iter_export_json(job: ScrapingJob):
+    """Yield {"job": ..., "businesses": [...]} a chunk of businesses at a time"""
+    # Rows appended by a still-running job after this point are left out
+    count = len(job.businesses)
+    yield b'{"job":' + _dumps(job.to_dict()) + b',"businesses":['
+    for start in range(0, count, EXPORT_CHUNK_SIZE):
+        chunk = b','.join(_dumps(b) for b in job.businesses[start:min(start + EXPORT_CHUNK_SIZE, count)])
+        yield chunk if start == 0 else b',' + chunk
+    yield b']}'
+
+
+# Saved documents store their CSV gzipped and base64'd behind this marker;
+# older documents hold the plain text
+_CSV_GZIP_PREFIX = 'gzip+b64:'
+
+
+def _pack_csv(csv_bytes: bytes) -> str:
+    """Encode CSV bytes for the csv_content column"""
+    return _CSV_GZIP_PREFIX + base64.b64encode(gzip.compress(csv_bytes, compresslevel=1)).decode('ascii')
+
+
+def _unpack_csv(content: str) -> bytes:
+    """Decode a csv_content value written by _pack_csv (or stored as plain text)"""
+    if content.startswith(_CSV_GZIP_PREFIX):
+        return gzip.decompress(base64.b64decode(content[len(_CSV_GZIP_PREFIX):]))
+    return content.encode('utf-8')
+
+
 @app.route('/api/documents', methods=['GET'])
 def get_saved_documents():
     """Get all saved documents from Supabase"""
@@ -313,7 +692,13 @@ def get_saved_documents():
         return jsonify({'error': 'Supabase not configured'}), 500
     
     try:
-        response = supabase.table('saved_documents').select('*').order('created_at', desc=True).execute()
+        # The list only shows metadata; csv_content and businesses are fetched per document
+        response = (
+            supabase.table('saved_documents')
+            .select('id,document_name,query,city,total_results,created_at,job_id')
+            .order('created_at', desc=True)
+            .execute()
+        )
         return jsonify({'documents': response.data})
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -328,7 +713,9 @@ def get_document(doc_id):
     try:
         response = supabase.table('saved_documents').select('*').eq('id', doc_id).single().execute()
         if response.data:
-            return jsonify(response.data)
+            doc = response.data
+            doc['csv_content'] = _unpack_csv(doc.get('csv_content') or '').decode('utf-8')
+            return jsonify(doc)
         return jsonify({'error': 'Document not found'}), 404
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -349,13 +736,17 @@ def download_document(doc_id):
             return jsonify({'error': 'Document not found'}), 404
         
         doc = response.data
-        csv_content = doc.get('csv_content', '')
+        csv_bytes = _unpack_csv(doc.get('csv_content', ''))
         
+        # send_file can only derive an ETag for paths, so give in-memory content one
+        # from its hash; a repeat download with If-None-Match then gets a 304
         return send_file(
-            io.BytesIO(csv_content.encode()),
+            io.BytesIO(csv_bytes),
             mimetype='text/csv',
             as_attachment=True,
-            download_name=f"{doc['document_name']}_{doc_id}.csv"
+            download_name=f"{doc['document_name']}_{doc_id}.csv",
+            etag=hashlib.sha1(csv_bytes).hexdigest(),
+            conditional=True
         )
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -395,8 +786,8 @@ def handle_save_document(data):
             csv_path = f"output/job_{job_id}/results.csv"
             csv_content = ""
             if os.path.exists(csv_path):
-                with open(csv_path, 'r', encoding='utf-8') as f:
-                    csv_content = f.read()
+                with open(csv_path, 'rb') as f:
+                    csv_content = _pack_csv(f.read())
             
             # Save to Supabase
             doc_data = {
@@ -475,18 +866,24 @@ def handle_start_scrape(data):
     # Create job
     job = job_manager.create_job(query, target_count)
     
+    # The starting client follows the job's events
+    join_room(job_room(job.id))
+    
     # Emit job created event
     emit('job_created', job.to_dict())
     
-    # Start scraping in background thread
-    thread = threading.Thread(
-        target=run_scraper,
-        args=(job.id, query, city, custom_bounds, tile_size, enrich_emails, headless, smart_mode)
-    )
-    thread.daemon = True
-    thread.start()
-    
-    job_manager.active_jobs[job.id] = thread
+    # Run the scrape on the shared job loop
+    job_manager.start_job(job.id, submit_job(run_limited(
+        run_scraper, job.id, query, city, custom_bounds, tile_size, enrich_emails, headless, smart_mode
+    )))
+
+
+@socketio.on('subscribe_job')
+def handle_subscribe_job(data):
+    """Follow a job's events, e.g. again after a reconnect"""
+    job_id = data.get('job_id')
+    if job_manager.get_job(job_id):
+        join_room(job_room(job_id))
 
 
 @socketio.on('stop_scrape')
@@ -501,7 +898,8 @@ def handle_stop_scrape(data):
             store = BusinessStore(output_dir=f"output/job_{job_id}")
             for biz_data in job.businesses:
                 store.add(Business(**biz_data))
-            store.save()
+            store.save(force=True)
+        emit_batcher.flush(job_id)
         emit('job_stopped', {'job_id': job_id, 'results_count': len(job.businesses)})
 
 
@@ -519,6 +917,8 @@ def handle_force_email_enrichment(data):
         emit('email_enrichment_error', {'job_id': job_id, 'error': 'No businesses to enrich'})
         return
     
+    join_room(job_room(job_id))
+    
     # Create CSV writer for this job
     output_dir = f"output/job_{job_id}"
     from storage import StreamingCSVWriter
@@ -527,40 +927,33 @@ def handle_force_email_enrichment(data):
         fieldnames=['place_id', 'name', 'address', 'phone', 'website', 'email', 'category', 'rating', 'review_count', 'latitude', 'longitude', 'scraped_at']
     )
     
-    # Run enrichment in background thread
-    def run_enrichment():
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+    # Run enrichment on the shared job loop; emits use socketio.emit since
+    # there is no request context there
+    async def run_enrichment():
         try:
-            # Create a set of seen place_ids (for compatibility)
-            seen_place_ids = set(b['place_id'] for b in job.businesses)
-            loop.run_until_complete(run_email_enrichment(
+            await run_email_enrichment(
                 job_id=job_id,
                 job=job,
                 csv_writer=csv_writer,
-                seen_place_ids=seen_place_ids,
+                seen_place_ids=job.biz_index.keys(),
                 smart_mode=False,
                 force=True  # Force update even if email exists
-            ))
-            emit('email_enrichment_manual_complete', {'job_id': job_id, 'message': 'Email enrichment complete!'})
+            )
+            socketio.emit('email_enrichment_manual_complete', {'job_id': job_id, 'message': 'Email enrichment complete!'}, to=job_room(job_id))
         except Exception as e:
-            import traceback
-            print(f"[Job {job_id}] Email enrichment error: {e}")
-            print(traceback.format_exc())
-            emit('email_enrichment_error', {'job_id': job_id, 'error': str(e)})
+            logger.exception("[Job %s] Email enrichment error: %s", job_id, e)
+            socketio.emit('email_enrichment_error', {'job_id': job_id, 'error': str(e)}, to=job_room(job_id))
         finally:
-            loop.close()
+            await asyncio.to_thread(csv_writer.close)
     
-    thread = threading.Thread(target=run_enrichment)
-    thread.daemon = True
-    thread.start()
+    submit_job(run_limited(run_enrichment))
     
     emit('email_enrichment_manual_started', {'job_id': job_id, 'message': f'Starting email enrichment for {len(job.businesses)} businesses...'})
 
 
-def run_scraper(job_id: str, query: str, city: str, custom_bounds: str, 
-                tile_size: float, enrich_emails: bool, headless: bool, smart_mode: bool = False):
-    """Run the scraper in a separate thread with proper SocketIO context"""
+async def run_scraper(job_id: str, query: str, city: str, custom_bounds: str, 
+                      tile_size: float, enrich_emails: bool, headless: bool, smart_mode: bool = False):
+    """Set up a job's tiles and run its scrape on the shared job loop"""
     
     job = job_manager.get_job(job_id)
     if not job:
@@ -570,20 +963,19 @@ def run_scraper(job_id: str, query: str, city: str, custom_bounds: str,
     if city:
         bounds = get_city_bounds(city)
     elif custom_bounds:
-        parts = custom_bounds.split(',')
-        bounds = tuple(map(float, parts))
+        bounds = tuple(map(float, _COMMA_RE.split(custom_bounds.strip())))
     else:
         socketio.emit('job_error', {
             'job_id': job_id,
             'error': 'No search area specified'
-        })
+        }, to=job_room(job_id))
         return
     
     if not bounds:
         socketio.emit('job_error', {
             'job_id': job_id,
             'error': 'Invalid search area'
-        })
+        }, to=job_room(job_id))
         return
     
     min_lat, max_lat, min_lng, max_lng = bounds
@@ -621,34 +1013,31 @@ def run_scraper(job_id: str, query: str, city: str, custom_bounds: str,
     tiles = tile_grid.create_grid(config, overlap=0.25)  # 25% overlap for maximum coverage
     job.tiles_total = len(tiles)
     
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Search area: {area_degrees:.2f} sq degrees, Tile size: {effective_tile_size:.3f}°, Tiles: {len(tiles)}, Overlap: 25%', 'level': 'info'})
+    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Search area: {area_degrees:.2f} sq degrees, Tile size: {effective_tile_size:.3f}°, Tiles: {len(tiles)}, Overlap: 25%', 'level': 'info'})
     
     # Emit job started
-    socketio.emit('job_started', job.to_dict())
-    print(f"[Job {job_id}] Started with {len(tiles)} tiles")
-    
-    # Create new event loop for this thread
-    loop = asyncio.new_event_loop()
-    asyncio.set_event_loop(loop)
+    emit_batcher.flush(job_id)
+    socketio.emit('job_started', job.to_dict(), to=job_room(job_id))
+    logger.info("[Job %s] Started with %d tiles", job_id, len(tiles))
     
     try:
-        # Run async scraper in this thread's event loop
-        loop.run_until_complete(scrape_worker(
+        await scrape_worker(
             job_id, job, tiles, query, tile_grid, enrich_emails, headless, smart_mode,
             search_center=(center_lat, center_lng), max_radius_km=max_radius_km
-        ))
+        )
     except Exception as e:
-        import traceback
-        print(f"[Job {job_id}] Error: {e}")
-        print(traceback.format_exc())
+        logger.exception("[Job %s] Error: %s", job_id, e)
         job.status = 'error'
         job.error = str(e)
+        emit_batcher.flush(job_id)
         socketio.emit('job_error', {
             'job_id': job_id,
             'error': str(e)
-        })
-    finally:
-        loop.close()
+        }, to=job_room(job_id))
+
+
+# Business websites crawled at the same time during web job enrichment
+WEB_ENRICH_CONCURRENCY = 8
 
 
 async def run_email_enrichment(job_id: str, job: ScrapingJob, csv_writer, seen_place_ids: set, smart_mode: bool = False, force: bool = False):
@@ -657,78 +1046,190 @@ async def run_email_enrichment(job_id: str, job: ScrapingJob, csv_writer, seen_p
     
     enriched_count = 0
     if not job.businesses:
-        socketio.emit('log_message', {'job_id': job_id, 'message': 'No businesses to enrich', 'level': 'warning'})
+        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': 'No businesses to enrich', 'level': 'warning'})
         return 0
     
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Starting email enrichment for {len(job.businesses)} businesses...', 'level': 'info'})
-    socketio.emit('email_enrichment_started', {'job_id': job_id, 'total': len(job.businesses)})
-    
-    async with EmailEnricher() as enricher:
-        for idx, biz_dict in enumerate(job.businesses):
-            if job_manager.should_stop(job_id):
-                break
-            
-            website = biz_dict.get('website')
-            if website:
+    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Starting email enrichment for {len(job.businesses)} businesses...', 'level': 'info'})
+    emit_batcher.flush(job_id)
+    socketio.emit('email_enrichment_started', {'job_id': job_id, 'total': len(job.businesses)}, to=job_room(job_id))
+    
+    total = len(job.businesses)
+    done_count = 0
+    semaphore = asyncio.Semaphore(WEB_ENRICH_CONCURRENCY)
+    
+    async def enrich(idx: int, biz_dict: dict):
+        """Crawl one business's website and report its result as soon as it lands"""
+        nonlocal enriched_count, done_count
+        website = biz_dict.get('website')
+        if website and not job_manager.should_stop(job_id):
+            async with semaphore:
+                if job_manager.should_stop(job_id):
+                    return
+                emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'[{idx+1}/{total}] Crawling {website}...', 'level': 'debug'})
                 try:
-                    socketio.emit('log_message', {'job_id': job_id, 'message': f'[{idx+1}/{len(job.businesses)}] Crawling {website}...', 'level': 'debug'})
                     results = await enricher.enrich_business_from_website(website, biz_dict.get('name', ''))
+                finally:
+                    done_count += 1
+                
+                if results:
+                    best_email = enricher.get_best_email(results)
+                    # Update if we found a better email or if forcing (always update)
+                    should_update = force or not biz_dict.get('email') or (best_email and len(best_email) > len(biz_dict.get('email', '')))
+                    if best_email and should_update:
+                        biz_dict['email'] = best_email
+                        biz_dict['emails'] = [r.email for r in results]
+                        enriched_count += 1
+                        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'  ✓ Found email: {best_email}', 'level': 'success'})
                     
-                    if results:
-                        best_email = enricher.get_best_email(results)
-                        # Update if we found a better email or if forcing (always update)
-                        should_update = force or not biz_dict.get('email') or (best_email and len(best_email) > len(biz_dict.get('email', '')))
-                        if best_email and should_update:
-                            biz_dict['email'] = best_email
-                            biz_dict['emails'] = [r.email for r in results]
-                            enriched_count += 1
-                            socketio.emit('log_message', {'job_id': job_id, 'message': f'  ✓ Found email: {best_email}', 'level': 'success'})
-                        
-                        # Update CSV with enriched email
-                        csv_writer.update_row(biz_dict)
-                        
-                        # Emit update to frontend
-                        socketio.emit('business_updated', {
-                            'job_id': job_id,
-                            'place_id': biz_dict['place_id'],
-                            'email': best_email,
-                            'emails': biz_dict.get('emails', []),
-                            'progress': {'current': idx+1, 'total': len(job.businesses), 'enriched': enriched_count}
-                        })
-                    else:
-                        socketio.emit('log_message', {'job_id': job_id, 'message': f'  No emails found', 'level': 'debug'})
-                    
-                    # Small delay to be nice to websites
-                    await asyncio.sleep(0.5)
+                    # Update CSV with enriched email
+                    csv_writer.update_row(biz_dict)
                     
-                except Exception as e:
-                    socketio.emit('log_message', {'job_id': job_id, 'message': f'  Error: {str(e)[:50]}', 'level': 'error'})
-            
-            socketio.emit('email_enrichment_progress', {
-                'job_id': job_id,
-                'current': idx+1,
-                'total': len(job.businesses),
-                'enriched': enriched_count
-            })
+                    # Emit update to frontend
+                    emit_batcher.push(job_id, 'business_updated', {
+                        'job_id': job_id,
+                        'place_id': biz_dict['place_id'],
+                        'email': best_email,
+                        'emails': biz_dict.get('emails', []),
+                        'progress': {'current': done_count, 'total': total, 'enriched': enriched_count}
+                    })
+                else:
+                    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'  No emails found', 'level': 'debug'})
+                
+                # Small delay to be nice to websites; the slot stays held meanwhile
+                await asyncio.sleep(0.5)
+        else:
+            done_count += 1
+        
+        emit_batcher.push(job_id, 'email_enrichment_progress', {
+            'job_id': job_id,
+            'current': done_count,
+            'total': total,
+            'enriched': enriched_count
+        })
+    
+    async with EmailEnricher(cache=places_cache) as enricher:  # Shared; no extra sqlite connection per run
+        # Websites are crawled concurrently, at most WEB_ENRICH_CONCURRENCY at a time
+        outcomes = await asyncio.gather(
+            *(enrich(idx, biz_dict) for idx, biz_dict in enumerate(job.businesses[:total])),
+            return_exceptions=True
+        )
+        for biz_dict, outcome in zip(job.businesses, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning("[Job %s] Error enriching %s: %s", job_id, biz_dict.get('website'), outcome)
+                emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'  Error: {str(outcome)[:50]}', 'level': 'error'})
     
+    emit_batcher.flush(job_id)
     socketio.emit('email_enrichment_completed', {
         'job_id': job_id,
         'enriched': enriched_count,
         'total': len(job.businesses)
-    })
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Email enrichment complete: {enriched_count}/{len(job.businesses)} businesses enriched', 'level': 'success'})
+    }, to=job_room(job_id))
+    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Email enrichment complete: {enriched_count}/{len(job.businesses)} businesses enriched', 'level': 'success'})
     
     return enriched_count
 
 
+def _job_row(business: Business, scraped_at: str) -> dict:
+    """Row kept in job.businesses, written to the CSV and sent to the UI"""
+    return {
+        'place_id': business.place_id,
+        'name': business.name or "Business (name not extracted)",
+        'address': business.address or f"Near {business.latitude:.4f}, {business.longitude:.4f}",
+        'phone': business.phone,
+        'website': business.website,
+        'email': business.email,
+        'emails': business.emails,
+        'rating': business.rating,
+        'review_count': business.review_count,
+        'category': business.category,
+        'latitude': business.latitude,
+        'longitude': business.longitude,
+        'hours': business.hours,
+        'description': business.description,
+        'social_media': business.social_media,
+        'scraped_at': scraped_at
+    }
+
+
+async def _add_search_results(job: ScrapingJob, businesses: List[Business], scraper: GoogleMapsScraper,
+                              csv_writer, smart_mode: bool) -> int:
+    """Add a search's new businesses to the job, its results file and the UI; returns how many"""
+    # Pick the new businesses (up to the target) before any details lookups
+    remaining = max(job.target_count - job.current_count, 0)
+    # One C-level set difference; passing the dict itself (not its keys view)
+    # makes it probe the dict per id instead of copying every seen id
+    new_ids = {b.place_id for b in businesses}.difference(job.biz_index)
+    if not new_ids:
+        return 0  # All already seen; nothing to look up, stamp or emit
+    if len(new_ids) == len(businesses):
+        new_businesses = businesses[:remaining]
+    else:
+        new_businesses = [b for b in businesses if b.place_id in new_ids][:remaining]
+    
+    # Fetch missing details for all of them concurrently
+    if smart_mode:
+        await scraper.get_many_business_details(
+            [b for b in new_businesses if not b.phone or not b.website]
+        )
+    
+    scraped_at = datetime.now().isoformat(timespec='seconds')  # One stamp per tile batch
+    rows = [_job_row(b, scraped_at) for b in new_businesses]
+    job.businesses.extend(rows)
+    job.biz_index.update((row['place_id'], row) for row in rows)
+    csv_writer.append_many(rows)
+    
+    job.current_count += len(rows)
+    if rows:
+        # One event and one log line per search, not two per business
+        emit_batcher.push(job.id, 'businesses_found_batch', {
+            'businesses': rows,
+            'current_count': job.current_count
+        })
+        emit_batcher.push(job.id, 'log_message', {'job_id': job.id, 'message': f'✓ Added {len(rows)} new businesses ({job.current_count}/{job.target_count})', 'level': 'success'})
+    
+    return len(rows)
+
+
+# Minimum seconds between progress_update emits while tiles are being searched
+PROGRESS_EMIT_INTERVAL = 0.1
+
+
+@lru_cache(maxsize=1024)
+def _build_search_variations(query: str) -> Tuple[str, ...]:
+    """
+    Smart-mode query variations, the query itself first, in a stable order
+    Variations that only differ from the query by case are dropped (same results)
+    """
+    words = query.split()
+    variations = [
+        f"{query} business",
+        f"{query} company",
+        f"{query} services",
+        query.replace(' ', ' and '),
+    ]
+    # Toggle the plural of one word at a time, by position rather than by substring replace
+    for i, word in enumerate(words):
+        swapped = word[:-1] if word.lower().endswith('s') else word + 's'
+        variations.append(' '.join(words[:i] + [swapped] + words[i+1:]))
+    
+    base = query.strip()
+    queries = [base] + [q.strip() for q in variations if q.strip() and q.strip().lower() != base.lower()]
+    return tuple(dict.fromkeys(q for q in queries if q))
+
+
 async def scrape_worker(job_id: str, job: ScrapingJob, tiles: list, query: str,
                        tile_grid: TileGrid, enrich_emails: bool, headless: bool, smart_mode: bool = False,
                        search_center: Tuple[float, float] = None, max_radius_km: float = None):
     """Async worker for scraping with deduplication, smart search, and radius expansion"""
+    # The work here is I/O-bound: Places API round trips (search_tile and the details
+    # lookups), results-file writes and Socket.IO emits. The per-business Python work is
+    # small next to them, so speedups come from concurrency, batching and caching, not
+    # from vectorising row handling. phase_s keeps the time spent in each, logged per job.
     from storage import StreamingCSVWriter
     
-    print(f"[Job {job_id}] Starting scrape_worker with {len(tiles)} tiles")
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Starting scraper with {len(tiles)} tiles...', 'level': 'info'})
+    logger.info("[Job %s] Starting scrape_worker with %d tiles", job_id, len(tiles))
+    job_channel = JobChannel(job_id)  # search_tile's log_batch goes to the job's room
+    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Starting scraper with {len(tiles)} tiles...', 'level': 'info'})
     
     # Create output directory and CSV file with headers at start
     output_dir = f"output/job_{job_id}"
@@ -737,220 +1238,205 @@ async def scrape_worker(job_id: str, job: ScrapingJob, tiles: list, query: str,
         filepath=f"{output_dir}/results.csv",
         fieldnames=['place_id', 'name', 'address', 'phone', 'website', 'email', 'category', 'rating', 'review_count', 'latitude', 'longitude', 'scraped_at']
     )
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Created results file: {csv_writer.get_path()}', 'level': 'info'})
-    
-    scraping_config = ScrapingConfig(
-        headless=headless,
-        delay_between_requests=float(os.getenv('RATE_LIMIT_DELAY', 0.5))
-    )
-    
-    # Track unique businesses by place_id
-    seen_place_ids: Set[str] = set()
-    
-    # Smart mode: generate search variations
-    search_queries = [query]
-    if smart_mode:
-        base_terms = query.lower().split()
-        variations = [
-            f"{query} business",
-            f"{query} company", 
-            f"{query} services",
-            query.replace(' ', ' and '),
-        ]
-        for term in base_terms:
-            if term.endswith('s'):
-                variations.append(query.replace(term, term[:-1]))
-            else:
-                variations.append(query.replace(term, term + 's'))
-        search_queries = list(set([q.strip() for q in search_queries + variations if q.strip()]))
-    
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Will search with queries: {search_queries}', 'level': 'info'})
-    
-    # Radius expansion settings
-    center_lat, center_lng = search_center if search_center else (None, None)
-    api_radius_multiplier = 1.0
-    max_expansion_multiplier = 3.0  # Max 3x the original search radius
-    expansion_increment = 0.5  # Increase by 50% each time
-    expansion_count = 0
-    max_expansions = 4  # Max 4 expansion attempts
-    
-    if max_radius_km:
-        socketio.emit('log_message', {'job_id': job_id, 'message': f'Radius filter: {max_radius_km}km from center, max expansion: {max_expansion_multiplier}x', 'level': 'info'})
-    
-    empty_tile_count = 0
-    # Scale max_empty_tiles with search area - larger areas need higher threshold
-    max_empty_tiles = max(5, len(tiles) // 10)  # At least 5, or 10% of tiles
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Empty tile threshold: {max_empty_tiles} (based on {len(tiles)} tiles)', 'level': 'debug'})
-    
-    socketio.emit('log_message', {'job_id': job_id, 'message': 'Initializing browser...', 'level': 'info'})
-    
+    # Closed on every exit, including cancellation by delete_job: CancelledError
+    # skips the except Exception below, and close() flushes buffered rows and
+    # folds in the updates journal
     try:
-        async with GoogleMapsScraper(scraping_config) as scraper:
-            socketio.emit('log_message', {'job_id': job_id, 'message': 'Browser ready, starting tile search...', 'level': 'success'})
-            
-            queries_to_try = search_queries if smart_mode else [query]
-            
-            # Main scraping loop with radius expansion
-            while expansion_count <= max_expansions:
-                if expansion_count > 0:
-                    socketio.emit('log_message', {
-                        'job_id': job_id, 
-                        'message': f'⚡ Radius expansion #{expansion_count}: {api_radius_multiplier:.1f}x API radius ({job.current_count}/{job.target_count} found)', 
-                        'level': 'warning'
-                    })
-                    # Reset all tiles to unsearched so we can search them again with larger radius
-                    for tile in tiles:
-                        tile.searched = False
-                        tile.business_count = 0
-                    empty_tile_count = 0
-                    job.tiles_completed = 0
+        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Created results file: {csv_writer.get_path()}', 'level': 'info'})
+        
+        scraping_config = ScrapingConfig(
+            headless=headless,
+            delay_between_requests=RATE_LIMIT_DELAY
+        )
+        
+        # Unique businesses are tracked by place_id in job.biz_index
+        seen_place_ids = job.biz_index.keys()
+        
+        # Smart mode: generate search variations
+        search_queries = list(_build_search_variations(query)) if smart_mode else [query]
+        
+        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Will search with queries: {search_queries}', 'level': 'info'})
+        
+        # Radius expansion settings
+        center_lat, center_lng = search_center if search_center else (None, None)
+        api_radius_multiplier = 1.0
+        max_expansion_multiplier = 3.0  # Max 3x the original search radius
+        expansion_increment = 0.5  # Increase by 50% each time
+        expansion_count = 0
+        max_expansions = 4  # Max 4 expansion attempts
+        
+        if max_radius_km:
+            emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Radius filter: {max_radius_km}km from center, max expansion: {max_expansion_multiplier}x', 'level': 'info'})
+        
+        empty_tile_count = 0
+        phase_s = {'api': 0.0, 'csv': 0.0, 'emit': 0.0}  # perf_counter seconds per phase
+        last_progress_ts = 0.0  # time.monotonic() of the last progress_update
+        # Scale max_empty_tiles with search area - larger areas need higher threshold
+        max_empty_tiles = max(5, len(tiles) // 10)  # At least 5, or 10% of tiles
+        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Empty tile threshold: {max_empty_tiles} (based on {len(tiles)} tiles)', 'level': 'debug'})
+        
+        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': 'Initializing browser...', 'level': 'info'})
+        
+        try:
+            # The shared cache lets repeat jobs over the same area replay searched tiles,
+            # and the shared session skips a fresh connection setup per job
+            async with GoogleMapsScraper(scraping_config, cache=places_cache, session=get_places_session()) as scraper:
+                emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': 'Browser ready, starting tile search...', 'level': 'success'})
+                
+                queries_to_try = search_queries if smart_mode else [query]
                 
-                for i, tile in enumerate(tiles):
-                    if job_manager.should_stop(job_id):
-                        job.status = 'stopped'
-                        socketio.emit('log_message', {'job_id': job_id, 'message': 'Job stopped by user - will run email enrichment', 'level': 'warning'})
+                # Main scraping loop with radius expansion
+                while expansion_count <= max_expansions:
+                    if expansion_count > 0:
+                        emit_batcher.push(job_id, 'log_message', {
+                            'job_id': job_id, 
+                            'message': f'⚡ Radius expansion #{expansion_count}: {api_radius_multiplier:.1f}x API radius ({job.current_count}/{job.target_count} found)', 
+                            'level': 'warning'
+                        })
+                        # Enlarged circles swallow neighbouring tile centers; search only one of each,
+                        # starting with the tiles that added the most businesses last pass
+                        pass_tiles = tile_grid.order_by_yield(
+                            tile_grid.skip_covered_tiles(tiles, api_radius_multiplier), search_center
+                        )
+                        
+                        # Reset all tiles to unsearched so we can search them again with larger radius
+                        for tile in tiles:
+                            tile.searched = False
+                            tile.business_count = 0
+                        empty_tile_count = 0
+                        job.tiles_completed = 0
+                        job.tiles_total = len(pass_tiles)
+                        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Searching {len(pass_tiles)} of {len(tiles)} tiles at {api_radius_multiplier:.1f}x radius', 'level': 'info'})
+                    else:
+                        # Nearest the search center first, so the sparse edges come last and
+                        # the empty-tile auto-stop cuts off there
+                        pass_tiles = tile_grid.order_by_yield(tiles, search_center)
+                    
+                    for i, tile in enumerate(pass_tiles):
+                        if job_manager.should_stop(job_id):
+                            job.status = 'stopped'
+                            emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': 'Job stopped by user - will run email enrichment', 'level': 'warning'})
+                            break
+                        
+                        if job.current_count >= job.target_count:
+                            emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Target reached: {job.target_count}', 'level': 'success'})
+                            break
+                        
+                        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Searching tile {i+1}/{len(pass_tiles)} (center: {tile.center[0]:.4f},{tile.center[1]:.4f})...', 'level': 'debug'})
+                        
+                        tile_found_businesses = False
+                        count_before_tile = job.current_count
+                        
+                        for search_query in queries_to_try:
+                            try:
+                                emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'  Query: "{search_query}" (expansion: {api_radius_multiplier:.1f}x)', 'level': 'debug'})
+                                emit_batcher.flush(job_id)  # search_tile emits its own log_batch
+                                t0 = time.perf_counter()
+                                businesses = await scraper.search_tile(
+                                    tile, search_query, job_id=job_id, socketio=job_channel,
+                                    center_lat=center_lat, center_lng=center_lng,
+                                    max_radius_km=max_radius_km, api_radius_multiplier=api_radius_multiplier
+                                )
+                                if businesses:
+                                    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'  Found {len(businesses)} businesses', 'level': 'info'})
+                                    # A search returning only businesses the job already has counts as empty
+                                    if await _add_search_results(job, businesses, scraper, csv_writer, smart_mode):
+                                        tile_found_businesses = True
+                                else:
+                                    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'  No results for "{search_query}"', 'level': 'debug'})
+                                phase_s['api'] += time.perf_counter() - t0
+                            
+                            except Exception as e:
+                                logger.error("Error searching tile %s with query '%s': %s", tile.id, search_query, e)
+                                emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Error: {str(e)[:50]}', 'level': 'error'})
+                        
+                        if not tile_found_businesses:
+                            empty_tile_count += 1
+                            emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Empty tile ({empty_tile_count}/{max_empty_tiles})', 'level': 'warning'})
+                            if empty_tile_count >= max_empty_tiles:
+                                # Check if we should expand radius
+                                if job.current_count < job.target_count and api_radius_multiplier < max_expansion_multiplier:
+                                    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Target not met ({job.current_count}/{job.target_count}), expanding search radius...', 'level': 'warning'})
+                                    break  # Break tile loop to trigger expansion
+                                # Otherwise stop searching but continue to email enrichment
+                                emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': 'Auto-stopped: No more businesses in area', 'level': 'warning'})
+                                break
+                        else:
+                            empty_tile_count = 0
+                        
+                        tile_grid.mark_tile_searched(tile.id, job.current_count - count_before_tile)
+                        # Make this tile's rows visible in the results file; the write runs on the
+                        # default executor so other jobs' coroutines keep going meanwhile
+                        t0 = time.perf_counter()
+                        await asyncio.to_thread(csv_writer.flush)
+                        phase_s['csv'] += time.perf_counter() - t0
+                        job.tiles_completed += 1
+                        
+                        # Fast tiles would flood the socket; the UI only needs a few updates a second
+                        now = time.monotonic()
+                        if now - last_progress_ts >= PROGRESS_EMIT_INTERVAL:
+                            t0 = time.perf_counter()
+                            emit_batcher.flush(job_id)  # Keep queued events ahead of the progress update
+                            socketio.emit('progress_update', job.progress_delta(), to=job_room(job_id))
+                            phase_s['emit'] += time.perf_counter() - t0
+                            last_progress_ts = now
+                    
+                    emit_batcher.flush(job_id)
+                    socketio.emit('progress_update', job.progress_delta(), to=job_room(job_id))  # Final state of this pass
+                    last_progress_ts = time.monotonic()
+                    
+                    # Check if user stopped the job - break out of expansion loop
+                    if job.status == 'stopped':
                         break
                     
+                    # Check if target met or max expansion reached
                     if job.current_count >= job.target_count:
-                        socketio.emit('log_message', {'job_id': job_id, 'message': f'Target reached: {job.target_count}', 'level': 'success'})
                         break
                     
-                    socketio.emit('log_message', {'job_id': job_id, 'message': f'Searching tile {i+1}/{len(tiles)} (center: {tile.center[0]:.4f},{tile.center[1]:.4f})...', 'level': 'debug'})
+                    if api_radius_multiplier >= max_expansion_multiplier or expansion_count >= max_expansions:
+                        emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Max radius expansion reached ({api_radius_multiplier:.1f}x). Found {job.current_count}/{job.target_count} businesses.', 'level': 'warning'})
+                        break
                     
-                    tile_found_businesses = False
+                    # Expand radius for next iteration
+                    api_radius_multiplier += expansion_increment
+                    expansion_count += 1
                     
-                    for search_query in queries_to_try:
-                        try:
-                            socketio.emit('log_message', {'job_id': job_id, 'message': f'  Query: "{search_query}" (expansion: {api_radius_multiplier:.1f}x)', 'level': 'debug'})
-                            businesses = await scraper.search_tile(
-                                tile, search_query, job_id=job_id, socketio=socketio,
-                                center_lat=center_lat, center_lng=center_lng,
-                                max_radius_km=max_radius_km, api_radius_multiplier=api_radius_multiplier
-                            )
-                            if businesses:
-                                socketio.emit('log_message', {'job_id': job_id, 'message': f'  Found {len(businesses)} businesses', 'level': 'info'})
-                                tile_found_businesses = True
-                                
-                                for business in businesses:
-                                    if job.current_count >= job.target_count:
-                                        break
-                                    
-                                    if business.place_id in seen_place_ids:
-                                        continue
-                                    
-                                    if not business.name:
-                                        business.name = "Business (name not extracted)"
-                                    if not business.address:
-                                        business.address = f"Near {business.latitude:.4f}, {business.longitude:.4f}"
-                                    
-                                    if smart_mode and (not business.phone or not business.website):
-                                        try:
-                                            await scraper.get_business_details(business)
-                                        except Exception as e:
-                                            print(f"Could not get details for {business.name}: {e}")
-                                    
-                                    seen_place_ids.add(business.place_id)
-                                    
-                                    biz_dict = {
-                                        'place_id': business.place_id,
-                                        'name': business.name,
-                                        'address': business.address,
-                                        'phone': business.phone,
-                                        'website': business.website,
-                                        'email': business.email,
-                                        'emails': business.emails,
-                                        'rating': business.rating,
-                                        'review_count': business.review_count,
-                                        'category': business.category,
-                                        'latitude': business.latitude,
-                                        'longitude': business.longitude,
-                                        'hours': business.hours,
-                                        'description': business.description,
-                                        'social_media': business.social_media,
-                                        'scraped_at': datetime.now().isoformat()
-                                    }
-                                    csv_writer.append(biz_dict)
-                                    job.businesses.append(biz_dict)
-                                    job.current_count += 1
-                                    
-                                    socketio.emit('business_found', {
-                                        'job_id': job_id,
-                                        'business': biz_dict,
-                                        'current_count': job.current_count
-                                    })
-                                    socketio.emit('log_message', {'job_id': job_id, 'message': f'✓ {business.name}', 'level': 'success'})
-                            else:
-                                socketio.emit('log_message', {'job_id': job_id, 'message': f'  No results for "{search_query}"', 'level': 'debug'})
-                        
-                        except Exception as e:
-                            print(f"Error searching tile {tile.id} with query '{search_query}': {e}")
-                            socketio.emit('log_message', {'job_id': job_id, 'message': f'Error: {str(e)[:50]}', 'level': 'error'})
+                    # Save current state before expansion
+                    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Expanding search: {job.current_count}/{job.target_count} found. Increasing API radius to {api_radius_multiplier:.1f}x...', 'level': 'info'})
                     
-                    if not tile_found_businesses:
-                        empty_tile_count += 1
-                        socketio.emit('log_message', {'job_id': job_id, 'message': f'Empty tile ({empty_tile_count}/{max_empty_tiles})', 'level': 'warning'})
-                        if empty_tile_count >= max_empty_tiles:
-                            # Check if we should expand radius
-                            if job.current_count < job.target_count and api_radius_multiplier < max_expansion_multiplier:
-                                socketio.emit('log_message', {'job_id': job_id, 'message': f'Target not met ({job.current_count}/{job.target_count}), expanding search radius...', 'level': 'warning'})
-                                break  # Break tile loop to trigger expansion
-                            # Otherwise stop searching but continue to email enrichment
-                            socketio.emit('log_message', {'job_id': job_id, 'message': 'Auto-stopped: No more businesses in area', 'level': 'warning'})
-                            break
-                    else:
-                        empty_tile_count = 0
-                    
-                    tile_grid.mark_tile_searched(tile.id, job.current_count)
-                    job.tiles_completed += 1
-                    socketio.emit('progress_update', job.to_dict())
-                
-                # Check if user stopped the job - break out of expansion loop
-                if job.status == 'stopped':
-                    break
-                
-                # Check if target met or max expansion reached
-                if job.current_count >= job.target_count:
-                    break
-                
-                if api_radius_multiplier >= max_expansion_multiplier or expansion_count >= max_expansions:
-                    socketio.emit('log_message', {'job_id': job_id, 'message': f'Max radius expansion reached ({api_radius_multiplier:.1f}x). Found {job.current_count}/{job.target_count} businesses.', 'level': 'warning'})
-                    break
-                
-                # Expand radius for next iteration
-                api_radius_multiplier += expansion_increment
-                expansion_count += 1
-                
-                # Save current state before expansion
-                socketio.emit('log_message', {'job_id': job_id, 'message': f'Expanding search: {job.current_count}/{job.target_count} found. Increasing API radius to {api_radius_multiplier:.1f}x...', 'level': 'info'})
-                
-    except Exception as e:
-        import traceback
-        print(f"[Job {job_id}] Scraper error: {e}")
-        print(traceback.format_exc())
-        socketio.emit('log_message', {'job_id': job_id, 'message': f'Fatal error: {str(e)}', 'level': 'error'})
-        job.status = 'error'
-        job.error = str(e)
-        socketio.emit('job_error', {'job_id': job_id, 'error': str(e)})
-        return
-    
-    # Only mark as completed if not already stopped by user
-    if job.status != 'stopped':
-        job.status = 'completed'
-        job.completed_at = datetime.now()
-    
-    # Phase 2: Email enrichment - ALWAYS run if enrich_emails is true, even when stopped
-    enriched_count = 0
-    if enrich_emails and job.businesses:
-        socketio.emit('log_message', {'job_id': job_id, 'message': f'Running email enrichment for {len(job.businesses)} businesses...', 'level': 'info'})
-        enriched_count = await run_email_enrichment(
-            job_id=job_id,
-            job=job,
-            csv_writer=csv_writer,
-            seen_place_ids=seen_place_ids,
-            smart_mode=smart_mode,
-            force=False
-        )
+        except Exception as e:
+            logger.exception("[Job %s] Scraper error: %s", job_id, e)
+            emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Fatal error: {str(e)}', 'level': 'error'})
+            job.status = 'error'
+            job.error = str(e)
+            emit_batcher.flush(job_id)
+            socketio.emit('job_error', {'job_id': job_id, 'error': str(e)}, to=job_room(job_id))
+            return
+        
+        logger.info("[Job %s] Scrape phases: api %.2fs, csv %.2fs, emit %.2fs",
+                    job_id, phase_s['api'], phase_s['csv'], phase_s['emit'])
+        
+        # Only mark as completed if not already stopped by user
+        if job.status != 'stopped':
+            job.status = 'completed'
+            job.completed_at = datetime.now()
+        
+        # Phase 2: Email enrichment - ALWAYS run if enrich_emails is true, even when stopped
+        enriched_count = 0
+        if enrich_emails and job.businesses:
+            emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Running email enrichment for {len(job.businesses)} businesses...', 'level': 'info'})
+            enriched_count = await run_email_enrichment(
+                job_id=job_id,
+                job=job,
+                csv_writer=csv_writer,
+                seen_place_ids=seen_place_ids,
+                smart_mode=smart_mode,
+                force=False
+            )
+    finally:
+        await asyncio.to_thread(csv_writer.close)  # May rewrite the whole file to fold in enriched rows
     
+    emit_batcher.flush(job_id)
     socketio.emit('job_completed', {
         **job.to_dict(),
         'deduplication_stats': {
@@ -961,9 +1447,14 @@ async def scrape_worker(job_id: str, job: ScrapingJob, tiles: list, query: str,
             'enriched': enriched_count,
             'total': len(job.businesses)
         }
-    })
-    socketio.emit('log_message', {'job_id': job_id, 'message': f'Completed! Found {len(seen_place_ids)} unique businesses', 'level': 'success'})
+    }, to=job_room(job_id))
+    emit_batcher.push(job_id, 'log_message', {'job_id': job_id, 'message': f'Completed! Found {len(seen_place_ids)} unique businesses', 'level': 'success'})
 
 
 if __name__ == '__main__':
+    # Log calls only enqueue the record; the listener thread does the blocking
+    # stdout writes, so errors logged on the job loop never stall it
+    log_queue = SimpleQueue()
+    logging.basicConfig(level=logging.INFO, format='%(message)s', handlers=[QueueHandler(log_queue)])
+    QueueListener(log_queue, logging.StreamHandler(sys.stdout)).start()
     socketio.run(app, debug=True, host='0.0.0.0', port=8082)